@@ -4,63 +4,220 @@ Connects to local Ollama instance running qwen2.5:7b model
 to provide natural language auction strategy insights.
 """
 
+import asyncio
+import functools
 import requests
 import json
+import hashlib
+import heapq
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from operator import itemgetter
+
+# orjson (optional) parses the many small NDJSON stream chunks much faster
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 
 OLLAMA_URL = "http://localhost:11434/api/generate"
 MODEL_NAME = "qwen2.5:7b" # Ensure this matches the model you pulled "gemma3:4b"
 
+# Server tuning: keep the model resident between requests (no cold reload)
+# and let Ollama serve the dashboard's concurrent requests in parallel.
+OLLAMA_KEEP_ALIVE = "30m"
+RECOMMENDED_NUM_PARALLEL = 4
+OLLAMA_SERVE_CMD = "OLLAMA_NUM_PARALLEL=4 OLLAMA_KEEP_ALIVE=30m ollama serve"
+
+# One pooled keep-alive session for every Ollama request, so repeated calls
+# reuse the TCP connection instead of opening a new socket each time.
+_SESSION = requests.Session()
+_SESSION.headers.update({"Connection": "keep-alive"})
+
+# ── Response cache ───────────────────────────────────────────────────
+# Identical requests (same model, prompt and options) are answered from an
+# on-disk cache instead of re-running generation. Delete the file to clear it.
+# The most recent entries are also kept in memory so repeat questions in a
+# session (same player, same squad state) skip the SQLite read as well.
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ollama_cache.db")
+CACHE_TTL_SECONDS = 24 * 60 * 60
+MEMORY_CACHE_SIZE = 256
+
+try:
+    _CACHE = sqlite3.connect(CACHE_PATH, check_same_thread=False)
+except sqlite3.Error:
+    _CACHE = sqlite3.connect(":memory:", check_same_thread=False)
+_CACHE.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, response TEXT, ts INTEGER)")
+_CACHE_LOCK = threading.Lock()
+_MEMORY_CACHE = OrderedDict()   # key -> (response, ts), least recently used first
+
+
+def _cache_key(payload):
+    """Hash the request payload (model + prompt + options) into a cache key."""
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.md5(raw.encode("utf-8")).hexdigest()
+
+
+def _cache_get(key):
+    """Return a cached response younger than the TTL, or None."""
+    with _CACHE_LOCK:
+        row = _MEMORY_CACHE.get(key)
+        if row is not None:
+            _MEMORY_CACHE.move_to_end(key)
+        else:
+            row = _CACHE.execute("SELECT response, ts FROM cache WHERE key = ?", (key,)).fetchone()
+            if row:
+                _remember(key, row)
+    if row and time.time() - row[1] < CACHE_TTL_SECONDS:
+        return row[0]
+    return None
+
+
+def _remember(key, row):
+    """Add a (response, ts) row to the in-memory LRU. Call with _CACHE_LOCK held."""
+    _MEMORY_CACHE[key] = tuple(row)
+    _MEMORY_CACHE.move_to_end(key)
+    if len(_MEMORY_CACHE) > MEMORY_CACHE_SIZE:
+        _MEMORY_CACHE.popitem(last=False)
+
+
+def _cache_put(key, response):
+    with _CACHE_LOCK:
+        _remember(key, (response, int(time.time())))
+        _CACHE.execute(
+            "INSERT OR REPLACE INTO cache (key, response, ts) VALUES (?, ?, ?)",
+            (key, response, int(time.time())),
+        )
+        _CACHE.commit()
+
 
-def _call_ollama(prompt, timeout=60):
+def _call_ollama_stream(prompt, timeout=60, num_predict=1024, temperature=0.2, top_p=0.9,
+                        system=None, format=None):
     """
-    Call local Ollama API with qwen2.5:7b model.
-    Returns the generated text or an error message.
+    Stream a response from the local Ollama API with qwen2.5:7b model.
+    Yields text chunks as the model generates them, or a single error message.
+    Completed responses are cached; a cache hit is yielded as one chunk.
+    num_predict caps the generated tokens — keep it small for short replies.
+    Keep temperature low: a high value makes cached answers arbitrary samples.
+    system is sent as Ollama's system prompt; it defaults to the auction rules.
+    format="json" puts Ollama in JSON mode.
     """
+    payload = {
+        "model": MODEL_NAME,
+        "system": AUCTION_RULES_SYSTEM if system is None else system,
+        "prompt": prompt,
+        "keep_alive": OLLAMA_KEEP_ALIVE,
+        "options": {
+            "temperature": temperature,
+            "top_p": top_p,
+            "num_predict": num_predict,
+        },
+    }
+    if format is not None:
+        payload["format"] = format
+    key = _cache_key(payload)
+    cached = _cache_get(key)
+    if cached is not None:
+        yield cached
+        return
+
+    chunks = []
     try:
-        response = requests.post(
+        with _SESSION.post(
             OLLAMA_URL,
-            json={
-                "model": MODEL_NAME,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": 0.7,
-                    "top_p": 0.9,
-                    "num_predict": 1024,
-                },
-            },
+            json={**payload, "stream": True},
             timeout=timeout,
-        )
-        if response.status_code == 200:
-            data = response.json()
-            return data.get("response", "No response generated.")
-        else:
-            return f"⚠️ Ollama returned status {response.status_code}: {response.text}"
+            stream=True,
+        ) as response:
+            if response.status_code != 200:
+                yield f"⚠️ Ollama returned status {response.status_code}: {response.text}"
+                return
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = _json_loads(line)
+                if "error" in chunk:
+                    yield f"⚠️ Ollama error: {chunk['error']}"
+                    return
+                text = chunk.get("response", "")
+                chunks.append(text)
+                yield text
+                if chunk.get("done"):
+                    if any(chunks):
+                        _cache_put(key, "".join(chunks))
+                    return
     except requests.exceptions.ConnectionError:
-        return (
+        yield (
             "⚠️ Cannot connect to Ollama. Make sure Ollama is running locally.\n\n"
             "**Setup instructions:**\n"
             "1. Install Ollama: `brew install ollama` (macOS) or visit https://ollama.ai\n"
             "2. Pull the model: `ollama pull qwen2.5:7b`\n"
-            "3. Start Ollama: `ollama serve`\n"
+            f"3. Start Ollama: `{OLLAMA_SERVE_CMD}`\n"
             "4. Refresh this page."
         )
     except requests.exceptions.Timeout:
-        return "⚠️ Ollama request timed out. The model might be loading — try again in a few seconds."
+        yield "⚠️ Ollama request timed out. The model might be loading — try again in a few seconds."
     except Exception as e:
-        return f"⚠️ Error calling Ollama: {str(e)}"
+        yield f"⚠️ Error calling Ollama: {str(e)}"
+
+
+def _call_ollama(prompt, timeout=60, num_predict=1024, temperature=0.2, top_p=0.9,
+                 system=None, format=None):
+    """
+    Call local Ollama API with qwen2.5:7b model.
+    Returns the generated text or an error message.
+    """
+    text = "".join(_call_ollama_stream(
+        prompt, timeout=timeout, num_predict=num_predict,
+        temperature=temperature, top_p=top_p, system=system, format=format,
+    ))
+    return text or "No response generated."
+
+
+# ── Status cache ─────────────────────────────────────────────────────
+# The status rarely changes, so the last (ok, msg) result is served for
+# STATUS_TTL_SECONDS. After that the stale value is still returned at once
+# while a daemon thread re-probes Ollama in the background.
+STATUS_TTL_SECONDS = 10
+_STATUS_CACHE = {"t": 0.0, "val": None, "refreshing": False}
+_STATUS_LOCK = threading.Lock()
 
 
 def check_ollama_status():
     """Check if Ollama is running and qwen2.5:7b model is available."""
+    with _STATUS_LOCK:
+        val = _STATUS_CACHE["val"]
+        fresh = time.monotonic() - _STATUS_CACHE["t"] < STATUS_TTL_SECONDS
+        if val is not None and not fresh and not _STATUS_CACHE["refreshing"]:
+            _STATUS_CACHE["refreshing"] = True
+            threading.Thread(target=_refresh_ollama_status, daemon=True).start()
+    if val is None:
+        return _refresh_ollama_status()
+    return val
+
+
+def _refresh_ollama_status():
+    """Probe Ollama and store the result in the status cache."""
+    val = _probe_ollama_status()
+    with _STATUS_LOCK:
+        _STATUS_CACHE.update(t=time.monotonic(), val=val, refreshing=False)
+    return val
+
+
+def _probe_ollama_status():
+    """Query /api/tags and report whether the qwen2.5:7b model is available."""
     try:
         # Check if Ollama is running
-        resp = requests.get("http://localhost:11434/api/tags", timeout=5)
+        resp = _SESSION.get("http://localhost:11434/api/tags", timeout=5)
         if resp.status_code != 200:
             return False, "Ollama is not responding."
 
-        models = resp.json().get("models", [])
+        models = _json_loads(resp.content).get("models", [])
         model_names = [m.get("name", "") for m in models]
 
         # Check for qwen2.5:7b (might be listed as qwen2.5:7b or qwen2.5:7b-latest)
@@ -68,27 +225,76 @@ def check_ollama_status():
         if not has_model:
             return False, f"Model qwen2.5:7b not found. Available: {', '.join(model_names) if model_names else 'None'}. Run `ollama pull qwen2.5:7b`."
 
-        return True, "✅ Ollama is running with qwen2.5:7b model."
+        notes = _server_config_notes()
+        return True, " ".join(["✅ Ollama is running with qwen2.5:7b model."] + notes)
     except requests.exceptions.ConnectionError:
-        return False, "Ollama is not running. Start it with `ollama serve`."
+        return False, f"Ollama is not running. Start it with `{OLLAMA_SERVE_CMD}`."
     except Exception as e:
         return False, f"Error checking Ollama: {str(e)}"
 
 
+def _server_config_notes():
+    """
+    Hints about server settings that slow responses down: the model not
+    being loaded (cold start on the next request, see /api/ps) and an
+    OLLAMA_NUM_PARALLEL below the recommended value in this environment.
+    """
+    notes = []
+    try:
+        resp = _SESSION.get("http://localhost:11434/api/ps", timeout=2)
+        if resp.status_code == 200:
+            loaded = [m.get("name", "") for m in _json_loads(resp.content).get("models", [])]
+            if not any("qwen2.5" in name for name in loaded):
+                notes.append("Model is not loaded yet — the first answer includes a cold start.")
+    except Exception:
+        pass
+
+    num_parallel = os.environ.get("OLLAMA_NUM_PARALLEL", "")
+    if num_parallel.isdigit() and int(num_parallel) < RECOMMENDED_NUM_PARALLEL:
+        notes.append(
+            f"OLLAMA_NUM_PARALLEL={num_parallel} queues concurrent insights; "
+            f"restart with `{OLLAMA_SERVE_CMD}`."
+        )
+    return notes
+
+
+# ── Prompt fragments ─────────────────────────────────────────────────
+# The same squads, pool and teams are formatted by several insight calls
+# per render. Inputs are frozen into tuples of the fields the text uses,
+# so identical state hits the LRU cache instead of being re-formatted.
+# Each line is rendered from a pre-built template joined straight from a
+# generator.
+
+# Row fields: 0 name, 1 tag suffix, 2 role, 3 bat, 4 bowl, 5 field,
+#             6 overall, 7 tier, 8 price suffix
+_SQUAD_TMPL = "  - {0}{1}: {2}, Bat={3}, Bowl={4}, Field={5}, OVR={6}, Tier {7}{8}"
+_POOL_TMPL = "  - {0}: {2}, Bat={3}, Bowl={4}, Field={5}, OVR={6}, Tier {7}"
+_TEAM_PLAYER_TMPL = "\n  - {0}{1}: {2}, OVR={3}"    # (name, tag suffix, role, overall)
+_TEAM_HEADER_TMPL = "\n**{0}** (Budget left: ₹{1}L, Slots left: {2}/9):"
+_LOG_TMPL = "  - {0} → {1} for ₹{2}L (Tier {3}, {4}, OVR={5})"
+
+
+def _player_row(p):
+    """Freeze the player fields used by the prompt formatters."""
+    tag = p.get("tag")
+    sold_price = p.get("sold_price", 0)
+    return (
+        p["name"], f" [{tag}]" if tag else "", p["role"],
+        p["batting"], p["bowling"], p["fielding"],
+        p["overall"], p["tier"], f", Price: ₹{sold_price}L" if sold_price > 0 else "",
+    )
+
+
 def _format_squad_summary(squad):
     """Format squad data into a concise text summary for the LLM."""
-    if not squad:
+    return _squad_summary_text(tuple(_player_row(p) for p in squad))
+
+
+@functools.lru_cache(maxsize=32)
+def _squad_summary_text(rows):
+    if not rows:
         return "Empty squad"
-    lines = []
-    for p in squad:
-        tag = f" [{p.get('tag', 'Auction')}]" if p.get('tag') else ""
-        price = f", Price: ₹{p['sold_price']}L" if p.get('sold_price', 0) > 0 else ""
-        lines.append(
-            f"  - {p['name']}{tag}: {p['role']}, "
-            f"Bat={p['batting']}, Bowl={p['bowling']}, Field={p['fielding']}, "
-            f"OVR={p['overall']}, Tier {p['tier']}{price}"
-        )
-    return "\n".join(lines)
+    return "\n".join(_SQUAD_TMPL.format(*r) for r in rows)
 
 
 def _format_player_summary(player):
@@ -102,41 +308,150 @@ def _format_player_summary(player):
 
 def _format_unsold_pool(unsold_players, limit=36):
     """Format the unsold player pool for the prompt."""
-    lines = []
-    for p in sorted(unsold_players, key=lambda x: -x['overall'])[:limit]:
-        lines.append(
-            f"  - {p['name']}: {p['role']}, "
-            f"Bat={p['batting']}, Bowl={p['bowling']}, Field={p['fielding']}, "
-            f"OVR={p['overall']}, Tier {p['tier']}"
-        )
-    return "\n".join(lines) if lines else "No unsold players remaining."
+    return _unsold_pool_text(tuple(_player_row(p) for p in unsold_players), limit)
+
+
+@functools.lru_cache(maxsize=32)
+def _unsold_pool_text(rows, limit):
+    top = heapq.nlargest(limit, rows, key=itemgetter(6))  # rows sorted by OVR desc
+    if not top:
+        return "No unsold players remaining."
+    return "\n".join(_POOL_TMPL.format(*r) for r in top)
 
 
 def _format_all_teams(all_teams_data):
     """Format all teams data for context."""
-    lines = []
-    for team_name, team_info in all_teams_data.items():
-        lines.append(f"\n**{team_name}** (Budget left: ₹{team_info['budget_left']}L, "
-                      f"Slots left: {team_info['slots_left']}/9):")
-        for p in team_info['squad']:
-            tag = f" [{p.get('tag', '')}]" if p.get('tag') else ""
-            lines.append(f"  - {p['name']}{tag}: {p['role']}, OVR={p['overall']}")
-    return "\n".join(lines)
+    return _all_teams_text(tuple(
+        (team_name, team_info['budget_left'], team_info['slots_left'],
+         tuple(_team_player_row(p) for p in team_info['squad']))
+        for team_name, team_info in all_teams_data.items()
+    ))
+
+
+def _team_player_row(p):
+    """Only the fields the all-teams listing prints, with one tag lookup."""
+    tag = p.get("tag")
+    return (p["name"], f" [{tag}]" if tag else "", p["role"], p["overall"])
+
+
+@functools.lru_cache(maxsize=32)
+def _all_teams_text(teams):
+    return "\n".join(
+        _TEAM_HEADER_TMPL.format(team_name, budget_left, slots_left)
+        + ("".join(_TEAM_PLAYER_TMPL.format(*r) for r in rows) if rows else "\n  (empty)")
+        for team_name, budget_left, slots_left, rows in teams
+    )
 
 
 def _format_auction_log(auction_log_data):
     """Format auction log for context."""
-    if not auction_log_data:
+    return _auction_log_text(tuple(
+        (e['name'], e['team'], e['price'], e['tier'], e['role'], e['overall'])
+        for e in auction_log_data
+    ))
+
+
+@functools.lru_cache(maxsize=32)
+def _auction_log_text(entries):
+    if not entries:
         return "No players sold yet."
-    lines = []
-    for entry in auction_log_data:
-        lines.append(f"  - {entry['name']} → {entry['team']} for ₹{entry['price']}L "
-                      f"(Tier {entry['tier']}, {entry['role']}, OVR={entry['overall']})")
-    return "\n".join(lines)
+    return "\n".join(_LOG_TMPL.format(*e) for e in entries)
+
+
+def index_by_role(players):
+    """Group players by role (keeps pool order) for O(1) same-role lookups."""
+    by_role = {}
+    for p in players:
+        by_role.setdefault(p["role"], []).append(p)
+    return by_role
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# STATIC PROMPT PREFIXES
+# The auction rules are sent once as Ollama's `system` field, and each
+# task's instructions open the prompt, ahead of the auction state. Both
+# are byte-identical across calls, so Ollama reuses their KV-cache and
+# only prefills the state. Keep these byte-stable: no f-strings.
+# ═══════════════════════════════════════════════════════════════════════
+
+AUCTION_RULES_SYSTEM = """You are an expert cricket auction strategist advising team captain "Abhijeet" in a fantasy cricket auction.
+
+## AUCTION RULES:
+- 4 teams, each gets 11 players (2 pre-assigned: Captain + Vice-Captain, 9 from auction)
+- Each team starts with ₹100L budget
+- Base price: ₹5L per player, Bid increment: ₹1L
+- Player ratings: Batting, Bowling, Fielding (0-10 scale)
+- Overall = Bat*40% + Bowl*40% + Field*20%
+- Need at least 6 players who can bowl (bowl≥4) in final 11"""
+
+STATE_HEADER = "\n\n## CURRENT AUCTION STATE:\n"
+
+BID_ADVICE_TASK = """## YOUR TASK:
+Using the auction state below, analyze and provide:
+1. **BID RECOMMENDATION**: Exact max bid amount (₹L) with reasoning
+2. **COMPETITION ANALYSIS**: Which other teams likely want this player and why (based on their needs & budgets)
+3. **RISK ASSESSMENT**: What happens if you overpay vs. miss this player
+4. **ALTERNATIVE PLAYERS**: Better/cheaper alternatives still in the pool
+5. **STRATEGY**: Should you bid aggressively, conservatively, or skip?
+
+Be specific with numbers. Keep it concise and actionable. Use cricket auction terminology."""
+
+BEST_TEAM_TASK = """Act as a cricket team builder.
+
+## YOUR TASK:
+Using the auction state below, provide a comprehensive analysis:
+1. **DREAM TEAM**: The ideal 11 Abhijeet should target (current squad + best picks from unsold pool)
+2. **PRIORITY TARGETS**: Top 3 must-buy players ranked by importance, with max bid for each
+3. **BUDGET STRATEGY**: How to distribute the remaining budget across the remaining auction slots (spend big on who, save on who)
+4. **THREAT ANALYSIS**: Which players will other teams fight for, driving up prices?
+5. **BACKUP PLAN**: If top targets are sniped, who are the fallback options?
+6. **TEAM RATING FORECAST**: Expected squad overall rating if strategy succeeds
+
+Be specific, use player names and numbers. Think like an IPL team strategist."""
+
+LIVE_INSIGHT_TASK = """Act as a quick-thinking live auction advisor. Give FAST, ACTIONABLE advice.
+
+Using the auction state below, give a QUICK 3-line response:
+1. 🎯 BID or SKIP? (and max amount)
+2. 💡 Why? (one sentence)
+3. ⚠️ Watch out for? (which team will compete)"""
+
+POST_AUCTION_TASK = """Act as a cricket analyst reviewing all 4 teams after/during the auction.
+
+Using the auction state below, provide:
+1. **POWER RANKINGS**: Rank all 4 teams with strengths & weaknesses
+2. **ABHIJEET'S GRADE**: A-F grade with justification
+3. **BEST BUYS**: Top 3 value-for-money picks across all teams
+4. **OVERPAYS**: Any players bought above fair value
+5. **PREDICTION**: Which team looks strongest for the tournament?
+
+Be honest and analytical. Use player names and stats."""
+
+COMBINED_BRIEFING_TASK = """Act as a live auction advisor answering three questions in one reply.
+
+## YOUR TASK:
+Using the auction state below, reply with ONLY a JSON object with exactly these string keys:
+- "bid": BID RECOMMENDATION — exact max bid (₹L) with reasoning, which teams will compete, and whether to bid aggressively, conservatively, or skip
+- "live": QUICK TAKE — 3 lines: 🎯 BID or SKIP? (and max amount), 💡 Why? (one sentence), ⚠️ Watch out for? (which team will compete)
+- "compare": HEAD TO HEAD — compare the player up for auction with the ALTERNATIVE player and say which one Abhijeet should target
+
+Use markdown inside the strings. Be specific with numbers and keep each answer concise."""
+
+PLAYER_COMPARISON_TASK = """Compare two cricket players for team "Abhijeet".
+
+Using the auction state below, compare:
+1. **HEAD TO HEAD**: Stats comparison
+2. **FIT FOR TEAM**: Who fills gaps better?
+3. **VALUE**: Who's worth more in auction?
+4. **VERDICT**: Pick one and explain why
+
+Keep it short and decisive."""
 
 
 # ═══════════════════════════════════════════════════════════════════════
 # PUBLIC API — AI INSIGHT FUNCTIONS
+# Pass stream=True to get a token generator (for st.write_stream) instead
+# of waiting for the full response text.
 # ═══════════════════════════════════════════════════════════════════════
 
 def get_bid_advice(
@@ -148,22 +463,14 @@ def get_bid_advice(
     squad_needs,
     optimizer_recommendation,
     all_teams_data,
+    stream=False,
 ):
     """
     Get AI advice on how much to bid for the current player.
     Considers team needs, player value, competition from other teams,
     remaining budget, and future players in the pool.
     """
-    prompt = f"""You are an expert cricket auction strategist advising team captain "Abhijeet" in a fantasy cricket auction.
-
-## AUCTION RULES:
-- 4 teams, each gets 11 players (2 pre-assigned: Captain + Vice-Captain, 9 from auction)
-- Each team starts with ₹100L budget
-- Base price: ₹5L per player, Bid increment: ₹1L
-- Player ratings: Batting, Bowling, Fielding (0-10 scale)
-- Overall = Bat*40% + Bowl*35% + Field*25%
-
-## CURRENT PLAYER UP FOR AUCTION:
+    state = f"""## CURRENT PLAYER UP FOR AUCTION:
 {_format_player_summary(player)}
 
 ## ABHIJEET'S CURRENT SQUAD:
@@ -186,19 +493,12 @@ def get_bid_advice(
 {_format_all_teams(all_teams_data)}
 
 ## REMAINING UNSOLD PLAYERS (future auction picks):
-{_format_unsold_pool(unsold_players)}
-
-## YOUR TASK:
-Analyze and provide:
-1. **BID RECOMMENDATION**: Exact max bid amount (₹L) with reasoning
-2. **COMPETITION ANALYSIS**: Which other teams likely want this player and why (based on their needs & budgets)
-3. **RISK ASSESSMENT**: What happens if you overpay vs. miss this player
-4. **ALTERNATIVE PLAYERS**: Better/cheaper alternatives still in the pool
-5. **STRATEGY**: Should you bid aggressively, conservatively, or skip?
+{_format_unsold_pool(unsold_players)}"""
 
-Be specific with numbers. Keep it concise and actionable. Use cricket auction terminology."""
-
-    return _call_ollama(prompt)
+    prompt = BID_ADVICE_TASK + STATE_HEADER + state
+    if stream:
+        return _call_ollama_stream(prompt, num_predict=512, temperature=0.5)
+    return _call_ollama(prompt, num_predict=512, temperature=0.5)
 
 
 def get_best_team_analysis(
@@ -209,6 +509,7 @@ def get_best_team_analysis(
     squad_needs,
     optimal_picks,
     all_teams_data,
+    stream=False,
 ):
     """
     Get AI analysis of the best possible team Abhijeet can build
@@ -216,14 +517,7 @@ def get_best_team_analysis(
     """
     optimal_text = _format_squad_summary(optimal_picks) if optimal_picks else "No optimal picks available."
 
-    prompt = f"""You are an expert cricket team builder advising "Abhijeet" in a fantasy cricket auction.
-
-## AUCTION RULES:
-- 4 teams, 11 players each (2 fixed + 9 auction), ₹100L budget per team
-- Ratings: Batting, Bowling, Fielding (0-10), Overall = Bat*40% + Bowl*35% + Field*25%
-- Need at least 6 players who can bowl (bowl≥4) in final 11
-
-## ABHIJEET'S CURRENT SQUAD ({len(my_squad)}/11):
+    state = f"""## ABHIJEET'S CURRENT SQUAD ({len(my_squad)}/11):
 {_format_squad_summary(my_squad)}
 
 ## SQUAD STATUS:
@@ -239,20 +533,12 @@ def get_best_team_analysis(
 {_format_all_teams(all_teams_data)}
 
 ## ALL UNSOLD PLAYERS:
-{_format_unsold_pool(unsold_players)}
+{_format_unsold_pool(unsold_players)}"""
 
-## YOUR TASK:
-Provide a comprehensive analysis:
-1. **DREAM TEAM**: The ideal 11 Abhijeet should target (current squad + best picks from unsold pool)
-2. **PRIORITY TARGETS**: Top 3 must-buy players ranked by importance, with max bid for each
-3. **BUDGET STRATEGY**: How to distribute ₹{budget_remaining}L across {slots_left} slots (spend big on who, save on who)
-4. **THREAT ANALYSIS**: Which players will other teams fight for, driving up prices?
-5. **BACKUP PLAN**: If top targets are sniped, who are the fallback options?
-6. **TEAM RATING FORECAST**: Expected squad overall rating if strategy succeeds
-
-Be specific, use player names and numbers. Think like an IPL team strategist."""
-
-    return _call_ollama(prompt, timeout=90)
+    prompt = BEST_TEAM_TASK + STATE_HEADER + state
+    if stream:
+        return _call_ollama_stream(prompt, timeout=90, temperature=0.0)
+    return _call_ollama(prompt, timeout=90, temperature=0.0)
 
 
 def get_live_auction_insight(
@@ -264,13 +550,18 @@ def get_live_auction_insight(
     squad_needs,
     all_teams_data,
     auction_log_data,
+    stream=False,
+    unsold_by_role=None,
 ):
     """
     Real-time AI insight during live auction — quick actionable advice.
+    Pass unsold_by_role (from index_by_role) to reuse the caller's role index
+    instead of rescanning the pool.
     """
-    prompt = f"""You are a quick-thinking cricket auction advisor. Give FAST, ACTIONABLE advice.
+    if unsold_by_role is None:
+        unsold_by_role = index_by_role(unsold_players)
 
-## PLAYER ON THE BLOCK:
+    state = f"""## PLAYER ON THE BLOCK:
 {_format_player_summary(current_player)}
 
 ## MY TEAM (Abhijeet):
@@ -285,14 +576,12 @@ def get_live_auction_insight(
 {_format_all_teams(all_teams_data)}
 
 ## KEY UNSOLD PLAYERS (similar role):
-{_format_unsold_pool([p for p in unsold_players if p['role'] == current_player['role']][:5])}
-
-Give a QUICK 3-line response:
-1. 🎯 BID or SKIP? (and max amount)
-2. 💡 Why? (one sentence)
-3. ⚠️ Watch out for? (which team will compete)"""
+{_format_unsold_pool(unsold_by_role.get(current_player['role'], [])[:5])}"""
 
-    return _call_ollama(prompt, timeout=30)
+    prompt = LIVE_INSIGHT_TASK + STATE_HEADER + state
+    if stream:
+        return _call_ollama_stream(prompt, timeout=30, num_predict=120)
+    return _call_ollama(prompt, timeout=30, num_predict=120)
 
 
 def get_post_auction_review(
@@ -300,13 +589,12 @@ def get_post_auction_review(
     budget_remaining,
     squad_needs,
     all_teams_data,
+    stream=False,
 ):
     """
     Post-auction or mid-auction team review and power ranking.
     """
-    prompt = f"""You are a cricket analyst reviewing all 4 teams after/during an auction.
-
-## ABHIJEET'S SQUAD:
+    state = f"""## ABHIJEET'S SQUAD:
 {_format_squad_summary(my_squad)}
 Budget remaining: ₹{budget_remaining}L
 
@@ -315,27 +603,19 @@ Budget remaining: ₹{budget_remaining}L
 
 ## SQUAD NEEDS (Abhijeet):
 - Batsmen: {squad_needs['bat_count']} | Bowlers: {squad_needs['bowl_count']} | ARs: {squad_needs['ar_count']}
-- Can bowl: {squad_needs['bowlers_who_can_bowl']}/6
+- Can bowl: {squad_needs['bowlers_who_can_bowl']}/6"""
 
-Provide:
-1. **POWER RANKINGS**: Rank all 4 teams with strengths & weaknesses
-2. **ABHIJEET'S GRADE**: A-F grade with justification
-3. **BEST BUYS**: Top 3 value-for-money picks across all teams
-4. **OVERPAYS**: Any players bought above fair value
-5. **PREDICTION**: Which team looks strongest for the tournament?
-
-Be honest and analytical. Use player names and stats."""
+    prompt = POST_AUCTION_TASK + STATE_HEADER + state
+    if stream:
+        return _call_ollama_stream(prompt, timeout=90, temperature=0.0)
+    return _call_ollama(prompt, timeout=90, temperature=0.0)
 
-    return _call_ollama(prompt, timeout=90)
 
-
-def get_player_comparison(player1, player2, my_squad, squad_needs, budget_remaining):
+def get_player_comparison(player1, player2, my_squad, squad_needs, budget_remaining, stream=False):
     """
     Compare two players head-to-head for auction decision.
     """
-    prompt = f"""Compare these two cricket players for team "Abhijeet":
-
-## PLAYER 1:
+    state = f"""## PLAYER 1:
 {_format_player_summary(player1)}
 
 ## PLAYER 2:
@@ -348,14 +628,87 @@ def get_player_comparison(player1, player2, my_squad, squad_needs, budget_remain
 - Gaps: {', '.join(squad_needs['role_needs']) if squad_needs['role_needs'] else 'None'}
 
 ## CURRENT SQUAD:
+{_format_squad_summary(my_squad)}"""
+
+    prompt = PLAYER_COMPARISON_TASK + STATE_HEADER + state
+    if stream:
+        return _call_ollama_stream(prompt, timeout=30, num_predict=200, temperature=0.0)
+    return _call_ollama(prompt, timeout=30, num_predict=200, temperature=0.0)
+
+
+def get_combined_briefing(
+    player,
+    alternative,
+    my_squad,
+    unsold_players,
+    budget_remaining,
+    slots_left,
+    squad_needs,
+    optimizer_recommendation,
+    all_teams_data,
+    auction_log_data,
+):
+    """
+    Bid advice, live quick take and a comparison against an alternative
+    player from one JSON-mode request instead of three separate calls.
+    Returns {"bid": ..., "live": ..., "compare": ...} as markdown strings.
+    """
+    alternative_text = _format_player_summary(alternative) if alternative else "No alternative player in the pool."
+
+    state = f"""## CURRENT PLAYER UP FOR AUCTION:
+{_format_player_summary(player)}
+
+## ALTERNATIVE PLAYER:
+{alternative_text}
+
+## ABHIJEET'S CURRENT SQUAD:
 {_format_squad_summary(my_squad)}
 
-Compare:
-1. **HEAD TO HEAD**: Stats comparison
-2. **FIT FOR TEAM**: Who fills gaps better?
-3. **VALUE**: Who's worth more in auction?
-4. **VERDICT**: Pick one and explain why
+## SQUAD NEEDS:
+- Budget remaining: ₹{budget_remaining}L
+- Auction slots left: {slots_left}/9
+- Batsmen: {squad_needs['bat_count']} | Bowlers: {squad_needs['bowl_count']} | All-rounders: {squad_needs['ar_count']}
+- Bowlers who can bowl (bowl≥4): {squad_needs['bowlers_who_can_bowl']}/6 needed
+- Gaps: {', '.join(squad_needs['role_needs']) if squad_needs['role_needs'] else 'None'}
 
-Keep it short and decisive."""
+## OPTIMIZER RECOMMENDATION:
+- Verdict: {optimizer_recommendation.get('verdict', 'N/A')}
+- Recommended max bid: ₹{optimizer_recommendation.get('recommended_max', 'N/A')}L
+- Marginal value: +{optimizer_recommendation.get('marginal_value', 0)} OVR
+- In optimal squad: {optimizer_recommendation.get('in_optimal', False)}
+
+## RECENT AUCTION SALES:
+{_format_auction_log(auction_log_data[-5:])}
+
+## OTHER TEAMS:
+{_format_all_teams(all_teams_data)}
+
+## REMAINING UNSOLD PLAYERS:
+{_format_unsold_pool(unsold_players)}"""
+
+    prompt = COMBINED_BRIEFING_TASK + STATE_HEADER + state
+    text = _call_ollama(prompt, timeout=90, format="json")
+    try:
+        answers = _json_loads(text)
+    except ValueError:
+        answers = None
+    if not isinstance(answers, dict):
+        # Connection/model errors come back as plain text — surface them as-is
+        return {"bid": text, "live": "", "compare": ""}
+    return {key: str(answers.get(key, "")) for key in ("bid", "live", "compare")}
+
+
+def run_insights_parallel(calls):
+    """
+    Run several insight requests concurrently and return their texts in order.
+    `calls` is a list of (insight_function, kwargs) pairs. Each blocking
+    request runs in a worker thread under asyncio.gather, so with Ollama
+    started as `OLLAMA_NUM_PARALLEL=4 ollama serve` the total wait is the
+    slowest call rather than the sum of all of them.
+    """
+    async def _gather():
+        return await asyncio.gather(*(
+            asyncio.to_thread(func, **kwargs) for func, kwargs in calls
+        ))
 
-    return _call_ollama(prompt, timeout=30)
+    return asyncio.run(_gather())
@@ -6,27 +6,34 @@ Each team ends with 11 players (2 fixed + 9 from auction).
 
 import streamlit as st
 import pandas as pd
-import copy
+import numpy as np
+import csv
 import io
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from players import (
     PLAYERS, AUCTION_PLAYERS, CAPTAINS, VICE_CAPTAINS,
     TEAMS, PRE_ASSIGNED, BUDGET_PER_TEAM, BASE_PRICE,
     BID_INCREMENT, SQUAD_SIZE, AUCTION_SLOTS,
     TOTAL_PLAYERS, TOTAL_AUCTION_PLAYERS,
-    classify_role, compute_overall, classify_tier,
+    classify_role, compute_overall, classify_tier, can_bowl,
 )
 from optimizer import (
     analyze_squad_needs, solve_optimal_squad,
     recommend_max_bid, get_ranked_recommendations,
-    estimate_competition, predict_auction_price,
-    build_best_team_snapshot,
-)
-from ai_insights import (
-    check_ollama_status, get_bid_advice,
-    get_best_team_analysis, get_live_auction_insight,
-    get_post_auction_review, get_player_comparison,
+    predict_auction_price, build_best_team_snapshot,
 )
 
+
+def _ai():
+    """Import the Ollama client on first use so startup doesn't pay for it.
+
+    Python keeps the module in sys.modules, so later calls are a dict lookup.
+    """
+    import ai_insights
+    return ai_insights
+
+
 # ── Page config ──────────────────────────────────────────────────────
 st.set_page_config(
     page_title="🏏 CricBazaar — Auction Planner",
@@ -55,18 +62,216 @@ st.markdown("""
     }
     .captain-badge { background: #FFD700; color: #333; padding: 2px 8px; border-radius: 4px; font-size: 0.75rem; font-weight: 700; }
     .vc-badge { background: #C0C0C0; color: #333; padding: 2px 8px; border-radius: 4px; font-size: 0.75rem; font-weight: 700; }
+    .tier-guide { display: grid; grid-template-columns: repeat(4, 1fr); gap: 16px; }
 </style>
 """, unsafe_allow_html=True)
 
+# ── HTML templates ───────────────────────────────────────────────────
+VERDICT_CARD_TMPL = """
+<div class="team-card" style="background: {color}; text-align: left;">
+    <p class="metric-big">{verdict}</p>
+    <p>{verdict_detail}</p>
+    <hr style="opacity:0.3">
+    <p>💰 <b>Recommended Max Bid: ₹{recommended_max}L</b> (Hard cap: ₹{hard_max}L)</p>
+    <p>📊 Marginal Value: <b>+{marginal_value} OVR</b> | Need Premium: {need_premium} | Tier Bonus: {tier_premium}</p>
+    <p>📈 Without: {baseline_ovr} OVR → With: {boosted_ovr} OVR</p>
+</div>
+"""
+
+TIER_GUIDE_HTML = """
+<div class="tier-guide">
+    <div class="team-card tier-1">
+        <p class="metric-big">🥇 Tier 1</p>
+        <p>OVR ≥ 7.5 or Captain/VC</p>
+        <p class="metric-label">Elite — bid aggressively</p>
+    </div>
+    <div class="team-card tier-2">
+        <p class="metric-big">🥈 Tier 2</p>
+        <p>OVR ≥ 5.5</p>
+        <p class="metric-label">Strong — solid value</p>
+    </div>
+    <div class="team-card tier-3">
+        <p class="metric-big">🥉 Tier 3</p>
+        <p>OVR ≥ 3.5</p>
+        <p class="metric-label">Decent — fill gaps</p>
+    </div>
+    <div class="team-card tier-4">
+        <p class="metric-big">🏷️ Tier 4</p>
+        <p>OVR &lt; 3.5</p>
+        <p class="metric-label">Budget — base price</p>
+    </div>
+</div>
+"""
+
 # ── Session state init ───────────────────────────────────────────────
 if "auction_log" not in st.session_state:
     st.session_state.auction_log = {}   # player_id -> {"team": str, "price": int}
 
 if "player_data" not in st.session_state:
-    st.session_state.player_data = copy.deepcopy(PLAYERS)
+    # Player dicts hold only scalars, so a per-dict copy isolates rating edits
+    st.session_state.player_data = [dict(p) for p in PLAYERS]
+
+if "player_by_id" not in st.session_state:
+    # Same dict objects as player_data, so in-place rating edits stay visible
+    st.session_state.player_by_id = {p["id"]: p for p in st.session_state.player_data}
+
+# auction_version is bumped on every sale, undo, reset and rating edit;
+# ratings_version only on rating edits. Derived views (squads, unsold pool,
+# all-teams data, captain sheets) are memoized per session against one of
+# them. This is a session-state memo rather than st.cache_data, which is
+# shared across sessions and would serve one user's squads to another.
+if "auction_version" not in st.session_state:
+    st.session_state.auction_version = 0
+    st.session_state.ratings_version = 0
+    st.session_state.derived_cache = {}
+
+# Per-team index of the auction log, kept in step by record_sale /
+# undo_last_sale / reset_auction so budget and slot queries are O(1)
+if "team_pids" not in st.session_state:
+    st.session_state.team_pids = {t: [] for t in TEAMS}     # team -> pids in purchase order
+    st.session_state.team_spent = {t: 0 for t in TEAMS}
+    st.session_state.team_count = {t: 0 for t in TEAMS}
+    for _pid, _info in st.session_state.auction_log.items():
+        st.session_state.team_pids[_info["team"]].append(_pid)
+        st.session_state.team_spent[_info["team"]] += _info["price"]
+        st.session_state.team_count[_info["team"]] += 1
+
+# Role / tier head-counts and rating totals per team (pre-assigned +
+# bought), adjusted on sale, undo, reset and rating edits.
+# OVR is kept in integer tenths so repeated add/remove never drifts.
+if "team_role_counts" not in st.session_state:
+    st.session_state.team_role_counts = {t: {} for t in TEAMS}
+    st.session_state.team_tier_counts = {t: {} for t in TEAMS}
+    st.session_state.team_totals = {
+        t: {"bat": 0, "bowl": 0, "field": 0, "ovr10": 0, "count": 0} for t in TEAMS
+    }
+    for _p in st.session_state.player_data:
+        _sale = st.session_state.auction_log.get(_p["id"])
+        _team = _sale["team"] if _sale else _p.get("team")
+        if _team:
+            _roles = st.session_state.team_role_counts[_team]
+            _tiers = st.session_state.team_tier_counts[_team]
+            _roles[_p["role"]] = _roles.get(_p["role"], 0) + 1
+            _tiers[_p["tier"]] = _tiers.get(_p["tier"], 0) + 1
+            _totals = st.session_state.team_totals[_team]
+            _totals["bat"] += _p["batting"]
+            _totals["bowl"] += _p["bowling"]
+            _totals["field"] += _p["fielding"]
+            _totals["ovr10"] += round(_p["overall"] * 10)
+            _totals["count"] += 1
+
+AUCTION_IDS = [p["id"] for p in AUCTION_PLAYERS]
+RECENT_LOG_SIZE = 10
+# Column order and dtypes of the Live Auction log table (OVR stays float)
+LOG_DF_DTYPES = {
+    "Player": "string", "Role": "category", "Tier": "int8",
+    "OVR": "float64", "Team": "category", "Price (₹L)": "int32",
+}
 
 
 # ── Helper functions ─────────────────────────────────────────────────
+def bump_auction_version():
+    """Invalidate memoized views after the auction log or ratings change."""
+    st.session_state.auction_version += 1
+
+
+def bump_ratings_version():
+    """Invalidate rating-dependent views (and with them all auction views)."""
+    st.session_state.ratings_version += 1
+    rebuild_recent_log()
+    bump_auction_version()
+
+
+def _adjust_team_counts(team_name, player, delta):
+    """Add (delta=1) or remove (delta=-1) a player from a team's counts and totals."""
+    roles = st.session_state.team_role_counts[team_name]
+    tiers = st.session_state.team_tier_counts[team_name]
+    roles[player["role"]] = roles.get(player["role"], 0) + delta
+    tiers[player["tier"]] = tiers.get(player["tier"], 0) + delta
+    totals = st.session_state.team_totals[team_name]
+    totals["bat"] += delta * player["batting"]
+    totals["bowl"] += delta * player["bowling"]
+    totals["field"] += delta * player["fielding"]
+    totals["ovr10"] += delta * round(player["overall"] * 10)
+    totals["count"] += delta
+
+
+def _log_row(pid, info):
+    """Display row for one auction log entry."""
+    p = st.session_state.player_by_id[pid]
+    return {
+        "Player": p["name"], "Role": p["role"], "Tier": p["tier"],
+        "OVR": p["overall"], "Team": info["team"], "Price (₹L)": info["price"],
+    }
+
+
+def rebuild_recent_log():
+    """Refill the recent-sales window from the auction log (oldest first)."""
+    log = st.session_state.auction_log
+    recent = deque(maxlen=RECENT_LOG_SIZE)
+    for pid in list(log)[-RECENT_LOG_SIZE:]:
+        recent.append(_log_row(pid, log[pid]))
+    st.session_state.recent_log = recent
+
+
+# Last few sales, newest at the right, for the Live Auction log
+if "recent_log" not in st.session_state:
+    rebuild_recent_log()
+
+
+def record_sale(pid, team_name, price):
+    """Log an auction sale and update the per-team index."""
+    st.session_state.auction_log[pid] = {"team": team_name, "price": price}
+    st.session_state.recent_log.append(_log_row(pid, st.session_state.auction_log[pid]))
+    st.session_state.team_pids[team_name].append(pid)
+    st.session_state.team_spent[team_name] += price
+    st.session_state.team_count[team_name] += 1
+    _adjust_team_counts(team_name, st.session_state.player_by_id[pid], 1)
+    bump_auction_version()
+
+
+def undo_last_sale():
+    """Remove the most recent sale; returns the player that was un-sold."""
+    pid = next(reversed(st.session_state.auction_log))
+    info = st.session_state.auction_log.pop(pid)
+    recent = st.session_state.recent_log
+    recent.pop()
+    if len(st.session_state.auction_log) > len(recent):
+        # Slide the window back to pull in the sale that scrolled out
+        older_pid = list(st.session_state.auction_log)[-RECENT_LOG_SIZE]
+        recent.appendleft(_log_row(older_pid, st.session_state.auction_log[older_pid]))
+    st.session_state.team_pids[info["team"]].pop()
+    st.session_state.team_spent[info["team"]] -= info["price"]
+    st.session_state.team_count[info["team"]] -= 1
+    player = st.session_state.player_by_id[pid]
+    _adjust_team_counts(info["team"], player, -1)
+    bump_auction_version()
+    return player
+
+
+def reset_auction():
+    """Clear every sale."""
+    for pid, info in st.session_state.auction_log.items():
+        _adjust_team_counts(info["team"], st.session_state.player_by_id[pid], -1)
+    st.session_state.auction_log = {}
+    st.session_state.team_pids = {t: [] for t in TEAMS}
+    st.session_state.team_spent = {t: 0 for t in TEAMS}
+    st.session_state.team_count = {t: 0 for t in TEAMS}
+    st.session_state.recent_log.clear()
+    bump_auction_version()
+
+
+def _memo(key, build, version="auction_version"):
+    """Return build() memoized in this session for the current value of `version`."""
+    cache = st.session_state.derived_cache.setdefault(version, {"version": None})
+    if cache["version"] != st.session_state[version]:
+        cache.clear()
+        cache["version"] = st.session_state[version]
+    if key not in cache:
+        cache[key] = build()
+    return cache[key]
+
+
 def get_pre_assigned_players(team_name):
     """Return the captain + VC pre-assigned to this team."""
     result = []
@@ -78,21 +283,20 @@ def get_pre_assigned_players(team_name):
 
 def get_auction_players(team_name):
     """Return auction players bought by this team."""
-    result = []
-    for pid, info in st.session_state.auction_log.items():
-        if info["team"] == team_name:
-            player = next(p for p in st.session_state.player_data if p["id"] == pid)
-            result.append({**player, "sold_price": info["price"]})
-    return result
+    log = st.session_state.auction_log
+    by_id = st.session_state.player_by_id
+    return [{**by_id[pid], "sold_price": log[pid]["price"]}
+            for pid in st.session_state.team_pids[team_name]]
 
 
 def get_full_squad(team_name):
-    """All players: pre-assigned + auction bought."""
-    return get_pre_assigned_players(team_name) + get_auction_players(team_name)
+    """All players: pre-assigned + auction bought. Treat as read-only (memoized)."""
+    return _memo(("squad", team_name),
+                 lambda: get_pre_assigned_players(team_name) + get_auction_players(team_name))
 
 
 def get_team_budget_spent(team_name):
-    return sum(info["price"] for info in st.session_state.auction_log.values() if info["team"] == team_name)
+    return st.session_state.team_spent[team_name]
 
 
 def get_team_remaining(team_name):
@@ -101,21 +305,87 @@ def get_team_remaining(team_name):
 
 def get_auction_count(team_name):
     """How many auction players this team bought."""
-    return sum(1 for info in st.session_state.auction_log.values() if info["team"] == team_name)
+    return st.session_state.team_count[team_name]
+
+
+def get_team_context(team_name):
+    """Squad, budget and slot figures for a team in one place (memoized)."""
+    def build():
+        auc_count = get_auction_count(team_name)
+        return {
+            "squad": get_full_squad(team_name),
+            "remaining": get_team_remaining(team_name),
+            "spent": get_team_budget_spent(team_name),
+            "auc_count": auc_count,
+            "slots_left": AUCTION_SLOTS - auc_count,
+        }
+    return _memo(("team_ctx", team_name), build)
 
 
 def get_unsold_players():
-    sold_ids = set(st.session_state.auction_log.keys())
-    return [p for p in st.session_state.player_data
-            if p["id"] not in sold_ids and p.get("tag") is None]
+    def build():
+        log = st.session_state.auction_log
+        by_id = st.session_state.player_by_id
+        return [by_id[pid] for pid in AUCTION_IDS if pid not in log]
+    return _memo("unsold", build)
+
+
+def get_unsold_by_overall():
+    """Unsold players, highest OVR first (memoized)."""
+    return _memo("unsold_by_overall",
+                 lambda: sorted(get_unsold_players(), key=lambda x: -x["overall"]))
+
+
+def get_ai_player_options():
+    """AI Insights bid-advisor and comparison labels -> id, best OVR first (memoized)."""
+    def build():
+        ranked = get_unsold_by_overall()
+        advisor = {
+            f"{p['name']} (Tier {p['tier']} | {p['role']} | OVR {p['overall']})": p["id"]
+            for p in ranked
+        }
+        compare = {f"{p['name']} ({p['role']} | T{p['tier']})": p["id"] for p in ranked}
+        return advisor, compare
+    return _memo("ai_player_options", build)
+
+
+def get_edit_player_options():
+    """Edit Ratings selectbox labels -> id for every player (memoized)."""
+    def build():
+        return {f"{p['name']} ({p.get('tag', 'Auction')})": p["id"]
+                for p in st.session_state.player_data}
+    return _memo("edit_player_options", build, version="ratings_version")
+
+
+def get_unsold_options():
+    """Live Auction selectbox labels -> player id, and id -> unsold player (memoized)."""
+    def build():
+        unsold = get_unsold_players()
+        labels = {
+            f"{p['name']} (Tier {p['tier']} | {p['role']} | OVR {p['overall']})": p["id"]
+            for p in unsold
+        }
+        return labels, {p["id"]: p for p in unsold}
+    return _memo("unsold_options", build)
 
 
 def role_count_full(team_name, role):
-    return sum(1 for p in get_full_squad(team_name) if p["role"] == role)
+    return st.session_state.team_role_counts[team_name].get(role, 0)
 
 
 def tier_count_full(team_name, tier):
-    return sum(1 for p in get_full_squad(team_name) if p["tier"] == tier)
+    return st.session_state.team_tier_counts[team_name].get(tier, 0)
+
+
+def team_total_overall(team_name):
+    """Total OVR of a team's full squad from the running totals."""
+    return st.session_state.team_totals[team_name]["ovr10"] / 10
+
+
+def team_avg_overall(team_name):
+    """Average OVR of a team's full squad from the running totals."""
+    totals = st.session_state.team_totals[team_name]
+    return round(totals["ovr10"] / 10 / totals["count"], 1) if totals["count"] else 0
 
 
 def max_affordable(team_name):
@@ -127,32 +397,335 @@ def max_affordable(team_name):
     return remaining - (slots_left - 1) * BASE_PRICE
 
 
+def update_player_ratings(player, batting, bowling, fielding):
+    """
+    Apply new ratings, recalculate derived fields and move the player between
+    role/tier buckets of the team that owns them. Caller bumps the version.
+    """
+    sale = st.session_state.auction_log.get(player["id"])
+    team = sale["team"] if sale else player.get("team")
+    if team:
+        _adjust_team_counts(team, player, -1)
+    player["batting"] = batting
+    player["bowling"] = bowling
+    player["fielding"] = fielding
+    recalc_player(player)
+    if team:
+        _adjust_team_counts(team, player, 1)
+
+
 def recalc_player(player):
     """Recalculate derived fields after a rating update."""
     player["role"] = classify_role(player)
     player["overall"] = compute_overall(player)
     player["tier"] = classify_tier(player)
+    player["can_bowl"] = can_bowl(player)
 
 
 def build_all_teams_data():
-    """Build a dict of all teams' current state for optimizer & AI."""
+    """Build a dict of all teams' current state for optimizer & AI (memoized)."""
+    return _memo("all_teams", _build_all_teams_data)
+
+
+def get_squad_needs(team_name):
+    """analyze_squad_needs for a team's full squad (memoized)."""
+    return _memo(("needs", team_name), lambda: analyze_squad_needs(get_full_squad(team_name)))
+
+
+def _build_all_teams_data():
     data = {}
     for tname in TEAMS:
-        squad = get_full_squad(tname)
+        ctx = get_team_context(tname)
         data[tname] = {
-            "squad": squad,
-            "budget_left": get_team_remaining(tname),
-            "slots_left": AUCTION_SLOTS - get_auction_count(tname),
-            "budget_spent": get_team_budget_spent(tname),
+            "squad": ctx["squad"],
+            "budget_left": ctx["remaining"],
+            "slots_left": ctx["slots_left"],
+            "budget_spent": ctx["spent"],
         }
     return data
 
 
+PLAYER_DF_DTYPES = {
+    "role": "category", "tag": "category", "current_team": "category",
+    "tier": "int8", "batting": "int8", "bowling": "int8", "fielding": "int8",
+}
+
+
+def get_players_df():
+    """
+    All players as one id-indexed DataFrame with their current team, sold
+    price and pre-assigned flag (memoized). Low-cardinality columns are
+    categorical / int8 for cheap masks and groupbys. player_data stays the
+    source of truth; use player_by_id when dict semantics are needed.
+    """
+    def build():
+        log = st.session_state.auction_log
+        rows = st.session_state.player_data
+        df = pd.DataFrame(rows)
+        df["current_team"] = [log[p["id"]]["team"] if p["id"] in log else p.get("team") for p in rows]
+        df["sold_price"] = [log[p["id"]]["price"] if p["id"] in log else 0 for p in rows]
+        df["is_pre"] = [p.get("tag") is not None for p in rows]
+        return df.astype(PLAYER_DF_DTYPES).set_index("id", drop=False)
+    return _memo("players_df", build)
+
+
+def build_captain_lines():
+    """Sidebar captain / vice-captain markdown lines (memoized on ratings)."""
+    def build():
+        lines = []
+        for tname in TEAMS:
+            pre = get_pre_assigned_players(tname)
+            cap = next((p for p in pre if p.get("tag") == "Captain"), None)
+            vc = next((p for p in pre if p.get("tag") == "Vice-Captain"), None)
+            lines.append(f"**{tname}:**")
+            if cap:
+                lines.append(f"  🏅 C: {cap['name']} ({cap['role']})")
+            if vc:
+                lines.append(f"  🥈 VC: {vc['name']} ({vc['role']})")
+        return lines
+    return _memo("captain_lines", build, version="ratings_version")
+
+
+def build_tier1_sheet_df():
+    """Tier 1 team sheet of captains and vice-captains (memoized on ratings)."""
+    def build():
+        sheet_rows = []
+        for p in CAPTAINS + VICE_CAPTAINS:
+            matched = st.session_state.player_by_id.get(p["id"])
+            sheet_rows.append({
+                "Team": p["team"],
+                "Player": p["name"],
+                "Tag": p["tag"],
+                "Role": p.get("forced_role", ""),
+                "Tier": "⭐ Tier 1",
+                "Batting": matched["batting"] if matched else p["batting"],
+                "Bowling": matched["bowling"] if matched else p["bowling"],
+                "Fielding": matched["fielding"] if matched else p["fielding"],
+                "Overall": matched["overall"] if matched else "",
+            })
+        return pd.DataFrame(sheet_rows)
+    return _memo("tier1_sheet", build, version="ratings_version")
+
+
+POOL_COLUMNS = ["ID", "Name", "Type", "Role", "Tier", "Bat", "Bowl", "Field", "OVR", "Status", "Price"]
+
+
+def build_player_pool_df():
+    """
+    Player Pool tab table for every player (memoized), with status/price
+    text built column-wise. Helper columns _tier and _taken drive the filters.
+    """
+    def build():
+        df = get_players_df()
+        is_pre = df["is_pre"].to_numpy()
+        is_sold = ~is_pre & df["current_team"].notna().to_numpy()
+        tag = df["tag"].astype("string").fillna("Auction")
+        team = df["current_team"].astype("string").fillna("")
+        status = np.select(
+            [is_pre, is_sold],
+            ["🏅 " + tag + " → " + team, "✅ " + team],
+            default="🔲 Available",
+        )
+        price = np.select(
+            [is_sold, is_pre],
+            ["₹" + df["sold_price"].astype("string") + "L", pd.Series("Fixed", index=df.index)],
+            default="—",
+        )
+        return pd.DataFrame({
+            "ID": df["id"], "Name": df["name"], "Type": tag,
+            "Role": df["role"].astype("string"), "Tier": "⭐ " + df["tier"].astype("string"),
+            "Bat": df["batting"], "Bowl": df["bowling"], "Field": df["fielding"],
+            "OVR": df["overall"], "Status": status, "Price": price,
+            "_tier": df["tier"], "_taken": is_pre | is_sold,
+        })
+    return _memo("player_pool", build)
+
+
+def build_team_comparison_df():
+    """Team Dashboard comparison table from one groupby over the players frame (memoized)."""
+    def build():
+        teams = list(TEAMS)
+        owned = get_players_df().dropna(subset=["current_team"])
+        agg = owned.assign(bought=~owned["is_pre"]).groupby("current_team", observed=True).agg(
+            total=("id", "size"), bought=("bought", "sum"),
+            spent=("sold_price", "sum"),
+        ).reindex(teams, fill_value=0)
+        roles = owned.pivot_table(index="current_team", columns="role", values="id",
+                                  aggfunc="count", fill_value=0, observed=True)
+        roles = roles.reindex(index=teams, columns=["Batsman", "Bowler", "All-rounder"], fill_value=0)
+        tiers = owned.pivot_table(index="current_team", columns="tier", values="id",
+                                  aggfunc="count", fill_value=0, observed=True)
+        tiers = tiers.reindex(index=teams, columns=[1, 2, 3, 4], fill_value=0)
+        return pd.DataFrame({
+            "Team": teams,
+            "Total": agg["total"].to_numpy(),
+            "Auction Bought": agg["bought"].to_numpy(),
+            "Budget Spent": [f"₹{v}L" for v in agg["spent"]],
+            "Budget Left": [f"₹{BUDGET_PER_TEAM - v}L" for v in agg["spent"]],
+            "Batsmen": roles["Batsman"].to_numpy(),
+            "Bowlers": roles["Bowler"].to_numpy(),
+            "All-rounders": roles["All-rounder"].to_numpy(),
+            "Avg OVR": [team_avg_overall(t) for t in teams],
+            "Tier 1": tiers[1].to_numpy(),
+            "Tier 2": tiers[2].to_numpy(),
+            "Tier 3": tiers[3].to_numpy(),
+            "Tier 4": tiers[4].to_numpy(),
+        })
+    return _memo("team_comparison", build)
+
+
+TIERS = [1, 2, 3, 4]
+
+# Card colour per bid verdict (unknown verdicts fall back to grey)
+VERDICT_COLORS = {
+    "🟢 MUST BUY": "#28a745",
+    "🟡 GOOD BUY": "#ffc107",
+    "🟡 NEED-BASED BUY": "#ffc107",
+    "🟡 BOWLING NEED": "#ffc107",
+    "🔴 SKIP / BASE ONLY": "#dc3545",
+}
+DEFAULT_VERDICT_COLOR = "#6c757d"
+
+# Small fixed vocabularies shown in the display tables
+ROLE_DTYPE = pd.CategoricalDtype(["Batsman", "Bowler", "All-rounder"])
+TIER_DTYPE = pd.CategoricalDtype(TIERS, ordered=True)
+VERDICT_DTYPE = pd.CategoricalDtype(list(VERDICT_COLORS))
+
+
+def _display_df(columns):
+    """Display table with Role, numeric Tier and Verdict as categoricals."""
+    df = pd.DataFrame(columns)
+    casts = {"Role": ROLE_DTYPE, "Verdict": VERDICT_DTYPE}
+    if "Tier" in df and pd.api.types.is_integer_dtype(df["Tier"]):
+        casts["Tier"] = TIER_DTYPE
+    return df.astype({c: t for c, t in casts.items() if c in df})
+
+
+# Fields a squad member may carry; absent ones come through as NaN
+SQUAD_COLUMNS = [
+    "id", "name", "role", "tier", "batting", "bowling", "fielding", "overall",
+    "tag", "sold_price",
+]
+
+
+def _by_overall(players, columns=None):
+    """Players as a DataFrame, highest OVR first (ties keep input order)."""
+    df = pd.DataFrame.from_records(players, columns=columns)
+    return df.sort_values("overall", ascending=False, kind="stable", ignore_index=True)
+
+
+def _rank(df):
+    """1-based row numbers for a display table."""
+    return np.arange(1, len(df) + 1)
+
+
+def get_best_team_snapshot(team_name):
+    """build_best_team_snapshot for a team's current position (memoized)."""
+    def build():
+        ctx = get_team_context(team_name)
+        return build_best_team_snapshot(
+            ctx["squad"], get_unsold_players(), ctx["remaining"],
+            ctx["slots_left"], build_all_teams_data(),
+        )
+    return _memo(("snapshot", team_name), build)
+
+
+def build_dream_team_df(team_name):
+    """Best Team Builder 'Dream 11' table (memoized)."""
+    def build():
+        dream = _by_overall(get_best_team_snapshot(team_name)["best_possible_squad"],
+                            columns=SQUAD_COLUMNS)
+        return _display_df({
+            "#": _rank(dream), "Name": dream["name"], "Role": dream["role"],
+            "Tier": "⭐" + dream["tier"].astype(str), "OVR": dream["overall"],
+            "Bat": dream["batting"], "Bowl": dream["bowling"], "Field": dream["fielding"],
+            "Can Bowl": np.where(dream["bowling"] >= 4, "✅", "❌"),
+            "Status": np.where(dream["tag"].fillna("") != "", "✅ In Squad", "🎯 Target"),
+        })
+    return _memo(("dream_df", team_name), build)
+
+
+def build_realistic_team_df(team_name):
+    """Best Team Builder competition-adjusted squad table (memoized)."""
+    def build():
+        real = _by_overall(
+            get_best_team_snapshot(team_name)["realistic_squad"],
+            columns=SQUAD_COLUMNS + ["estimated_cost", "competition_level", "acq_probability"],
+        )
+        tag = real["tag"].fillna("")
+        fixed = (tag != "").to_numpy()
+        target = ~fixed & real["estimated_cost"].notna().to_numpy()
+        target_cost = "₹" + real["estimated_cost"].astype("Int64").astype(str) + "L"
+        bought_cost = "₹" + real["sold_price"].fillna(0).astype(int).astype(str) + "L"
+        chance = (real["acq_probability"].fillna(0) * 100).astype(int).astype(str) + "%"
+        return _display_df({
+            "#": _rank(real), "Name": real["name"], "Role": real["role"],
+            "Tier": real["tier"], "OVR": real["overall"],
+            "Est. Cost": np.select([fixed, target], ["Fixed", target_cost], bought_cost),
+            "Competition": np.where(target, real["competition_level"].fillna("—"), "—"),
+            "Chance": np.where(target, chance, "—"),
+            "Status": np.select([fixed, target], ["✅ " + tag, "🎯 Target"], "✅ Bought"),
+        })
+    return _memo(("realistic_df", team_name), build)
+
+
+def build_final_squad_df(team_name):
+    """Completed squad table, best OVR first (memoized)."""
+    def build():
+        final = _by_overall(get_full_squad(team_name), columns=SQUAD_COLUMNS)
+        sold_price = final["sold_price"].fillna(0).astype(int)
+        return _display_df({
+            "#": _rank(final), "Name": final["name"], "Role": final["role"],
+            "Tier": final["tier"], "OVR": final["overall"],
+            "Bat": final["batting"], "Bowl": final["bowling"], "Field": final["fielding"],
+            "Type": final["tag"].fillna("Auction"),
+            "Price": np.where(sold_price > 0, "₹" + sold_price.astype(str) + "L", "Fixed"),
+        })
+    return _memo(("final_df", team_name), build)
+
+
+TIER_TAG_SUFFIX = {"Captain": " 🏅C", "Vice-Captain": " 🥈VC"}
+TIER_EMOJI = {1: "🥇", 2: "🥈", 3: "🥉", 4: "🏷️"}
+
+
+def build_tier_summary_df():
+    """All players bucketed by tier, best OVR first within each (memoized)."""
+    def build():
+        df = get_players_df().sort_values("overall", ascending=False, kind="stable")
+        labels = df["name"] + df["tag"].astype(object).map(TIER_TAG_SUFFIX).fillna("")
+        by_tier = labels.groupby(df["tier"]).agg([", ".join, "size"]).reindex(TIERS)
+        return pd.DataFrame({
+            "Tier": [f"Tier {t}" for t in TIERS],
+            "Count": by_tier["size"].fillna(0).astype(int).to_numpy(),
+            "Players": by_tier["join"].fillna("").to_numpy(),
+        })
+    return _memo("tier_summary", build)
+
+
+def build_tier_spending_df():
+    """Auction spend per team and tier from one groupby (memoized)."""
+    def build():
+        df = get_players_df()
+        bought = df[~df["is_pre"] & df["current_team"].notna()]
+        agg = bought.groupby(["current_team", "tier"], observed=True)["sold_price"].agg(["sum", "size"])
+        agg = agg.reindex(pd.MultiIndex.from_product([list(TEAMS), TIERS]), fill_value=0)
+        totals, counts = agg["sum"].tolist(), agg["size"].tolist()
+        avgs = [round(t / n, 1) if n else 0 for t, n in zip(totals, counts)]
+        return pd.DataFrame({
+            "Team": agg.index.get_level_values(0),
+            "Tier": [f"Tier {t}" for t in agg.index.get_level_values(1)],
+            "Players": counts,
+            "Total Spent": [f"₹{t}L" for t in totals],
+            "Avg Price": [f"₹{a}L" for a in avgs],
+        })
+    return _memo("tier_spending", build)
+
+
 def build_auction_log_data():
     """Build a list of auction log entries for AI context."""
     log_data = []
     for pid, info in st.session_state.auction_log.items():
-        p = next(pl for pl in st.session_state.player_data if pl["id"] == pid)
+        p = st.session_state.player_by_id[pid]
         log_data.append({
             "name": p["name"], "role": p["role"], "tier": p["tier"],
             "overall": p["overall"], "team": info["team"], "price": info["price"],
@@ -160,28 +733,33 @@ def build_auction_log_data():
     return log_data
 
 
+TEAM_CSV_FIELDS = [
+    "#", "Name", "Role", "Type", "Tier",
+    "Batting", "Bowling", "Fielding", "Overall", "Price (₹L)",
+]
+
+
 def build_team_csv(team_name):
-    """Build a CSV string for a team's full squad."""
-    squad = get_full_squad(team_name)
-    rows = []
-    for i, p in enumerate(squad, 1):
-        tag = p.get("tag", "Auction")
-        rows.append({
-            "#": i,
-            "Name": p["name"],
-            "Role": p["role"],
-            "Type": tag,
-            "Tier": p["tier"],
-            "Batting": p["batting"],
-            "Bowling": p["bowling"],
-            "Fielding": p["fielding"],
-            "Overall": p["overall"],
-            "Price (₹L)": p.get("sold_price", 0),
-        })
-    df = pd.DataFrame(rows)
-    buf = io.StringIO()
-    df.to_csv(buf, index=False)
-    return buf.getvalue()
+    """Build UTF-8 CSV bytes for a team's full squad (memoized per team)."""
+    def build():
+        buf = io.StringIO()
+        writer = csv.writer(buf, lineterminator="\n")
+        writer.writerow(TEAM_CSV_FIELDS)
+        for i, p in enumerate(get_full_squad(team_name), 1):
+            writer.writerow((
+                i,
+                p["name"],
+                p["role"],
+                p.get("tag", "Auction"),
+                p["tier"],
+                p["batting"],
+                p["bowling"],
+                p["fielding"],
+                p["overall"],
+                p.get("sold_price", 0),
+            ))
+        return buf.getvalue().encode("utf-8")
+    return _memo(("team_csv", team_name), build)
 
 
 # ── Sidebar ──────────────────────────────────────────────────────────
@@ -212,19 +790,12 @@ with st.sidebar:
 
     # Pre-assigned reference
     with st.expander("👑 Captains & Vice-Captains"):
-        for tname in TEAMS:
-            pre = get_pre_assigned_players(tname)
-            cap = next((p for p in pre if p.get("tag") == "Captain"), None)
-            vc = next((p for p in pre if p.get("tag") == "Vice-Captain"), None)
-            st.markdown(f"**{tname}:**")
-            if cap:
-                st.markdown(f"  🏅 C: {cap['name']} ({cap['role']})")
-            if vc:
-                st.markdown(f"  🥈 VC: {vc['name']} ({vc['role']})")
+        for line in build_captain_lines():
+            st.markdown(line)
 
     st.divider()
     if st.button("🔄 Reset Entire Auction", type="secondary", use_container_width=True):
-        st.session_state.auction_log = {}
+        reset_auction()
         st.rerun()
 
     st.divider()
@@ -260,8 +831,13 @@ tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8 = st.tabs([
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # TAB 1 — LIVE AUCTION
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-with tab1:
-    st.markdown("## ⚡ Record a Player Sale")
+@st.fragment
+def live_auction_panel():
+    """Sale form and Live Bid Advisor.
+
+    Runs as a fragment: changing the player, team or price reruns only this
+    panel. Confirm Sale calls st.rerun(), which reruns the whole app.
+    """
     unsold = get_unsold_players()
 
     if not unsold:
@@ -270,13 +846,10 @@ with tab1:
         col_form, col_preview = st.columns([3, 2])
 
         with col_form:
-            player_options = {
-                f"{p['name']} (Tier {p['tier']} | {p['role']} | OVR {p['overall']})": p["id"]
-                for p in unsold
-            }
+            player_options, unsold_by_id = get_unsold_options()
             selected_label = st.selectbox("🎯 Select Player", list(player_options.keys()))
             selected_id = player_options[selected_label]
-            selected_player = next(p for p in unsold if p["id"] == selected_id)
+            selected_player = unsold_by_id[selected_id]
 
             eligible_teams = [t for t in TEAMS if get_auction_count(t) < AUCTION_SLOTS]
             if not eligible_teams:
@@ -293,7 +866,7 @@ with tab1:
                 )
 
                 if st.button("✅ Confirm Sale", type="primary", use_container_width=True):
-                    st.session_state.auction_log[selected_id] = {"team": sold_to, "price": sold_price}
+                    record_sale(selected_id, sold_to, sold_price)
                     st.success(f"🎉 {selected_player['name']} sold to **{sold_to}** for ₹{sold_price}L!")
                     st.rerun()
 
@@ -315,26 +888,27 @@ with tab1:
         st.markdown("### 🎯 Live Bid Advisor")
 
         my_team_live = "Abhijeet"
-        my_squad_live = get_full_squad(my_team_live)
-        my_remaining_live = get_team_remaining(my_team_live)
-        my_slots_live = AUCTION_SLOTS - get_auction_count(my_team_live)
+        my_ctx_live = get_team_context(my_team_live)
+        my_squad_live = my_ctx_live["squad"]
+        my_remaining_live = my_ctx_live["remaining"]
+        my_slots_live = my_ctx_live["slots_left"]
         all_teams_live = build_all_teams_data()
 
         if my_slots_live > 0:
-            # Quick optimizer recommendation
-            bid_rec = recommend_max_bid(
-                selected_player, my_squad_live, unsold,
-                my_remaining_live, my_slots_live
-            )
-            # Competition analysis
-            competitors = estimate_competition(selected_player, all_teams_live, unsold)
-            price_pred = predict_auction_price(selected_player, all_teams_live, unsold)
+            # Optimizer recommendation and price prediction are independent —
+            # run them side by side. The prediction carries the competition list.
+            with ThreadPoolExecutor(max_workers=2) as advisor_pool:
+                bid_fut = advisor_pool.submit(
+                    recommend_max_bid, selected_player, my_squad_live, unsold,
+                    my_remaining_live, my_slots_live,
+                )
+                pred_fut = advisor_pool.submit(predict_auction_price, selected_player, all_teams_live, unsold)
+                bid_rec, price_pred = bid_fut.result(), pred_fut.result()
+            competitors = price_pred["competitors"]
 
             adv1, adv2, adv3 = st.columns(3)
             with adv1:
-                v_color = {"🟢 MUST BUY": "#28a745", "🟡 GOOD BUY": "#ffc107",
-                           "🟡 NEED-BASED BUY": "#ffc107", "🟡 BOWLING NEED": "#ffc107",
-                           "🔴 SKIP / BASE ONLY": "#dc3545"}.get(bid_rec['verdict'], "#6c757d")
+                v_color = VERDICT_COLORS.get(bid_rec['verdict'], DEFAULT_VERDICT_COLOR)
                 st.markdown(f"""
                 <div class="team-card" style="background: {v_color}; text-align: left; padding: 12px;">
                     <p style="font-size:1.2rem; font-weight:800; margin:0;">{bid_rec['verdict']}</p>
@@ -376,36 +950,60 @@ with tab1:
             # AI Quick Insight button
             if st.button("🤖 Get AI Quick Insight", key="ai_quick_live", use_container_width=True):
                 with st.spinner("🤖 Asking Qwen2.5 for advice..."):
-                    squad_needs_live = analyze_squad_needs(my_squad_live)
+                    squad_needs_live = get_squad_needs(my_team_live)
                     auction_log_live = build_auction_log_data()
-                    insight = get_live_auction_insight(
+                    st.markdown("#### 🤖 AI Quick Take")
+                    st.write_stream(_ai().get_live_auction_insight(
                         selected_player, my_squad_live, unsold,
                         my_remaining_live, my_slots_live,
-                        squad_needs_live, all_teams_live, auction_log_live
+                        squad_needs_live, all_teams_live, auction_log_live,
+                        stream=True, unsold_by_role=_ai().index_by_role(unsold),
+                    ))
+
+            if st.button("🤖 Get AI Full Briefing (one request)", key="ai_briefing_live",
+                         use_container_width=True):
+                with st.spinner("🤖 Asking Qwen2.5 for bid advice, quick take and comparison..."):
+                    same_role = _ai().index_by_role(unsold)[selected_player["role"]]
+                    alternative = max(
+                        (p for p in same_role if p["id"] != selected_id),
+                        key=lambda x: x["overall"], default=None,
                     )
-                    st.markdown("#### 🤖 AI Quick Take")
-                    st.markdown(insight)
+                    briefing = _ai().get_combined_briefing(
+                        selected_player, alternative, my_squad_live, unsold,
+                        my_remaining_live, my_slots_live,
+                        get_squad_needs(my_team_live), bid_rec,
+                        all_teams_live, build_auction_log_data(),
+                    )
+                st.markdown("#### 🤖 AI Quick Take")
+                st.markdown(briefing["live"])
+                st.markdown("#### 💰 AI Bid Advice")
+                st.markdown(briefing["bid"])
+                if alternative:
+                    st.markdown(f"#### ⚖️ {selected_player['name']} vs {alternative['name']}")
+                    st.markdown(briefing["compare"])
         else:
             st.success("Your squad is complete! No more slots to fill.")
 
+
+with tab1:
+    st.markdown("## ⚡ Record a Player Sale")
+    live_auction_panel()
+
     # Auction log
     st.divider()
     st.markdown("### 📜 Auction Log")
     if st.session_state.auction_log:
-        log_data = []
-        for pid, info in reversed(list(st.session_state.auction_log.items())):
-            p = next(pl for pl in st.session_state.player_data if pl["id"] == pid)
-            log_data.append({
-                "Player": p["name"], "Role": p["role"], "Tier": p["tier"],
-                "OVR": p["overall"], "Team": info["team"], "Price (₹L)": info["price"],
-            })
-        st.dataframe(pd.DataFrame(log_data), use_container_width=True, hide_index=True)
+        total_sales = len(st.session_state.auction_log)
+        if total_sales > RECENT_LOG_SIZE:
+            st.caption(f"Latest {RECENT_LOG_SIZE} of {total_sales} sales — full squads are on the Team Dashboard")
+        log_df = pd.DataFrame.from_records(
+            list(reversed(st.session_state.recent_log)), columns=list(LOG_DF_DTYPES),
+        ).astype(LOG_DF_DTYPES)
+        st.dataframe(log_df, use_container_width=True, hide_index=True)
 
         if st.button("↩️ Undo Last Sale"):
-            last_pid = list(st.session_state.auction_log.keys())[-1]
-            last_name = next(p["name"] for p in st.session_state.player_data if p["id"] == last_pid)
-            del st.session_state.auction_log[last_pid]
-            st.info(f"Undid sale of {last_name}")
+            last_player = undo_last_sale()
+            st.info(f"Undid sale of {last_player['name']}")
             st.rerun()
     else:
         st.info("No players sold yet. Start the auction above!")
@@ -419,10 +1017,11 @@ with tab2:
     team_cols = st.columns(4)
     for idx, (tname, tinfo) in enumerate(TEAMS.items()):
         with team_cols[idx]:
-            remaining = get_team_remaining(tname)
-            auc_count = get_auction_count(tname)
+            ctx = get_team_context(tname)
+            remaining = ctx["remaining"]
+            auc_count = ctx["auc_count"]
             total_count = auc_count + 2
-            full_squad = get_full_squad(tname)
+            full_squad = ctx["squad"]
 
             st.markdown(f"""
             <div class="team-card" style="background: {tinfo['color']};">
@@ -460,7 +1059,7 @@ with tab2:
                         elif tag == "Vice-Captain":
                             badge = "🥈 VC"
                         else:
-                            badge = {1: "🥇", 2: "🥈", 3: "🥉", 4: "🏷️"}[p["tier"]]
+                            badge = TIER_EMOJI[p["tier"]]
                         price_str = f"₹{p['sold_price']}L" if p.get("sold_price", 0) > 0 else "Pre-assigned"
                         st.markdown(f"{badge} **{p['name']}** — {p['role']} | OVR {p['overall']} | {price_str}")
 
@@ -477,45 +1076,12 @@ with tab2:
     # Comparison table
     st.divider()
     st.markdown("### 📊 Team Comparison")
-    comp_data = []
-    for tname in TEAMS:
-        squad = get_full_squad(tname)
-        avg_ovr = round(sum(p["overall"] for p in squad) / len(squad), 1) if squad else 0
-        comp_data.append({
-            "Team": tname,
-            "Total": len(squad),
-            "Auction Bought": get_auction_count(tname),
-            "Budget Spent": f"₹{get_team_budget_spent(tname)}L",
-            "Budget Left": f"₹{get_team_remaining(tname)}L",
-            "Batsmen": role_count_full(tname, "Batsman"),
-            "Bowlers": role_count_full(tname, "Bowler"),
-            "All-rounders": role_count_full(tname, "All-rounder"),
-            "Avg OVR": avg_ovr,
-            "Tier 1": tier_count_full(tname, 1),
-            "Tier 2": tier_count_full(tname, 2),
-            "Tier 3": tier_count_full(tname, 3),
-            "Tier 4": tier_count_full(tname, 4),
-        })
-    st.dataframe(pd.DataFrame(comp_data), use_container_width=True, hide_index=True)
+    st.dataframe(build_team_comparison_df(), use_container_width=True, hide_index=True)
 
     # Tier 1 team sheet
     st.divider()
     st.markdown("### ⭐ Tier 1 Team Sheet (Captains & Vice-Captains)")
-    sheet_rows = []
-    for p in CAPTAINS + VICE_CAPTAINS:
-        matched = next((pl for pl in st.session_state.player_data if pl["id"] == p["id"]), None)
-        sheet_rows.append({
-            "Team": p["team"],
-            "Player": p["name"],
-            "Tag": p["tag"],
-            "Role": p.get("forced_role", ""),
-            "Tier": "⭐ Tier 1",
-            "Batting": matched["batting"] if matched else p["batting"],
-            "Bowling": matched["bowling"] if matched else p["bowling"],
-            "Fielding": matched["fielding"] if matched else p["fielding"],
-            "Overall": matched["overall"] if matched else "",
-        })
-    st.dataframe(pd.DataFrame(sheet_rows), use_container_width=True, hide_index=True)
+    st.dataframe(build_tier1_sheet_df(), use_container_width=True, hide_index=True)
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # TAB 3 — PLAYER POOL
@@ -535,55 +1101,69 @@ with tab3:
     with filter_col4:
         status_filter = st.radio("Status", ["All", "Unsold Only", "Sold/Assigned"], horizontal=True)
 
-    pool_data = []
-    for p in st.session_state.player_data:
-        if p["role"] not in role_filter or p["tier"] not in tier_filter:
-            continue
-        tag = p.get("tag", "Auction")
-        if tag not in type_filter:
-            continue
-
-        is_pre = p["id"] in PRE_ASSIGNED
-        is_auction_sold = p["id"] in st.session_state.auction_log
-        if status_filter == "Unsold Only" and (is_pre or is_auction_sold):
-            continue
-        if status_filter == "Sold/Assigned" and not is_pre and not is_auction_sold:
-            continue
-
-        sold_info = st.session_state.auction_log.get(p["id"], {})
-        if is_pre:
-            status_str = f"🏅 {PRE_ASSIGNED[p['id']]['tag']} → {PRE_ASSIGNED[p['id']]['team']}"
-        elif is_auction_sold:
-            status_str = f"✅ {sold_info['team']}"
-        else:
-            status_str = "🔲 Available"
-
-        price_str = f"₹{sold_info['price']}L" if is_auction_sold else ("Fixed" if is_pre else "—")
-
-        pool_data.append({
-            "ID": p["id"], "Name": p["name"], "Type": tag,
-            "Role": p["role"], "Tier": f"⭐ {p['tier']}",
-            "Bat": p["batting"], "Bowl": p["bowling"], "Field": p["fielding"],
-            "OVR": p["overall"], "Status": status_str, "Price": price_str,
-        })
-
-    pool_df = pd.DataFrame(pool_data)
-    if not pool_df.empty:
-        pool_df = pool_df.sort_values("OVR", ascending=False)
+    pool = build_player_pool_df()
+    mask = (pool["Role"].isin(role_filter) & pool["_tier"].isin(tier_filter)
+            & pool["Type"].isin(type_filter))
+    if status_filter == "Unsold Only":
+        mask &= ~pool["_taken"]
+    elif status_filter == "Sold/Assigned":
+        mask &= pool["_taken"]
+    pool_df = (pool.loc[mask, POOL_COLUMNS]
+               .sort_values("OVR", ascending=False)
+               .reset_index(drop=True))
     st.dataframe(pool_df, use_container_width=True, hide_index=True)
     st.caption(f"Showing {len(pool_df)} of {TOTAL_PLAYERS} players")
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # TAB 4 — MY STRATEGY (ABHIJEET)
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+@st.fragment
+def player_analysis_panel(team_name, recs):
+    """Detailed bid card for one recommended player.
+
+    Runs as a fragment so picking another player only reruns this card.
+    """
+    ctx = get_team_context(team_name)
+    my_squad = ctx["squad"]
+    my_remaining = ctx["remaining"]
+    auc_slots_left = ctx["slots_left"]
+    unsold_available = get_unsold_players()
+
+    # Detailed per-player cards
+    st.divider()
+    st.markdown("### 🔍 Detailed Player Analysis")
+    st.caption("Select a player to see detailed bid recommendation.")
+
+    player_labels = {f"{r['name']} ({r['role']} | Tier {r['tier']})": r['id'] for r in recs}
+    sel_label = st.selectbox("Pick a player to analyze", list(player_labels.keys()), key="rec_player")
+    sel_id = player_labels[sel_label]
+    sel_p = st.session_state.player_by_id[sel_id]
+
+    bid_info = recommend_max_bid(sel_p, my_squad, unsold_available, my_remaining, auc_slots_left)
+
+    # Verdict card
+    v_color = VERDICT_COLORS.get(bid_info['verdict'], DEFAULT_VERDICT_COLOR)
+
+    st.markdown(VERDICT_CARD_TMPL.format_map({**bid_info, "color": v_color}),
+                unsafe_allow_html=True)
+
+    # Player stats
+    st.markdown("")
+    det1, det2, det3, det4 = st.columns(4)
+    det1.metric("🏏 Batting", sel_p['batting'])
+    det2.metric("🎳 Bowling", sel_p['bowling'])
+    det3.metric("🧤 Fielding", sel_p['fielding'])
+    det4.metric("📊 Overall", sel_p['overall'])
+
+
 with tab4:
     st.markdown("## 🏆 Abhijeet's Strategy Console")
 
     my_team = "Abhijeet"
-    my_squad = get_full_squad(my_team)
-    my_remaining = get_team_remaining(my_team)
-    my_auc_count = get_auction_count(my_team)
-    auc_slots_left = AUCTION_SLOTS - my_auc_count
+    my_ctx = get_team_context(my_team)
+    my_squad = my_ctx["squad"]
+    my_remaining = my_ctx["remaining"]
+    auc_slots_left = my_ctx["slots_left"]
 
     col_s1, col_s2, col_s3, col_s4 = st.columns(4)
     col_s1.metric("💰 Budget Left", f"₹{my_remaining}L")
@@ -627,24 +1207,21 @@ with tab4:
 
     # Squad strength
     if my_squad:
-        avg_ovr = round(sum(p["overall"] for p in my_squad) / len(my_squad), 1)
-        total_bat = sum(p["batting"] for p in my_squad)
-        total_bowl = sum(p["bowling"] for p in my_squad)
-        total_field = sum(p["fielding"] for p in my_squad)
+        my_totals = st.session_state.team_totals[my_team]
         st.divider()
         st.markdown("### 📊 Squad Strength")
         ms1, ms2, ms3, ms4 = st.columns(4)
-        ms1.metric("Avg Overall", avg_ovr)
-        ms2.metric("Total Batting", total_bat)
-        ms3.metric("Total Bowling", total_bowl)
-        ms4.metric("Total Fielding", total_field)
+        ms1.metric("Avg Overall", team_avg_overall(my_team))
+        ms2.metric("Total Batting", my_totals["bat"])
+        ms3.metric("Total Bowling", my_totals["bowl"])
+        ms4.metric("Total Fielding", my_totals["field"])
 
     st.divider()
     unsold_available = get_unsold_players()
 
     if unsold_available and auc_slots_left > 0:
         # ── Squad Needs Analysis ──────────────────────────────────
-        analysis = analyze_squad_needs(my_squad)
+        analysis = get_squad_needs(my_team)
         st.markdown("### 🔬 Squad Needs Analysis")
 
         na1, na2, na3, na4 = st.columns(4)
@@ -670,19 +1247,16 @@ with tab4:
         optimal = solve_optimal_squad(unsold_available, my_squad, my_remaining, auc_slots_left)
         if optimal:
             opt_ovr = sum(p['overall'] for p in optimal)
-            full_ovr = sum(p['overall'] for p in my_squad) + opt_ovr
+            full_ovr = team_total_overall(my_team) + opt_ovr
             st.markdown(f"**Optimal picks add {opt_ovr:.1f} OVR** → Full squad OVR: **{full_ovr:.1f}**")
 
-            opt_data = []
-            for rank, p in enumerate(sorted(optimal, key=lambda x: -x['overall']), 1):
-                can_b = "✅" if p['bowling'] >= 4 else "❌"
-                opt_data.append({
-                    "#": rank, "Name": p['name'], "Role": p['role'],
-                    "Tier": f"⭐{p['tier']}", "OVR": p['overall'],
-                    "Bat": p['batting'], "Bowl": p['bowling'], "Field": p['fielding'],
-                    "Can Bowl": can_b,
-                })
-            st.dataframe(pd.DataFrame(opt_data), use_container_width=True, hide_index=True)
+            opt = _by_overall(optimal)
+            st.dataframe(_display_df({
+                "#": _rank(opt), "Name": opt["name"], "Role": opt["role"],
+                "Tier": "⭐" + opt["tier"].astype(str), "OVR": opt["overall"],
+                "Bat": opt["batting"], "Bowl": opt["bowling"], "Field": opt["fielding"],
+                "Can Bowl": np.where(opt["bowling"] >= 4, "✅", "❌"),
+            }), use_container_width=True, hide_index=True)
         else:
             st.info("Solver could not find a feasible solution with current constraints.")
 
@@ -695,62 +1269,20 @@ with tab4:
 
         if recs:
             # Summary table
-            rec_table = []
-            for rank, r in enumerate(recs, 1):
-                in_opt = "⭐" if r.get('in_optimal') else ""
-                rec_table.append({
-                    "Rank": rank,
-                    "Player": r['name'],
-                    "Role": r['role'],
-                    "Tier": r['tier'],
-                    "OVR": r['overall'],
-                    "Score": r['score'],
-                    "Max Bid (₹L)": r['recommended_max'],
-                    "Verdict": r['verdict'],
-                    "In Optimal": in_opt,
-                })
-            st.dataframe(pd.DataFrame(rec_table), use_container_width=True, hide_index=True)
-
-            # Detailed per-player cards
-            st.divider()
-            st.markdown("### 🔍 Detailed Player Analysis")
-            st.caption("Select a player to see detailed bid recommendation.")
-
-            player_labels = {f"{r['name']} ({r['role']} | Tier {r['tier']})": r['id'] for r in recs}
-            sel_label = st.selectbox("Pick a player to analyze", list(player_labels.keys()), key="rec_player")
-            sel_id = player_labels[sel_label]
-            sel_p = next(p for p in unsold_available if p['id'] == sel_id)
-
-            bid_info = recommend_max_bid(sel_p, my_squad, unsold_available, my_remaining, auc_slots_left)
-
-            # Verdict card
-            verdict_colors = {
-                "🟢 MUST BUY": "#28a745",
-                "🟡 GOOD BUY": "#ffc107",
-                "🟡 NEED-BASED BUY": "#ffc107",
-                "🟡 BOWLING NEED": "#ffc107",
-                "🔴 SKIP / BASE ONLY": "#dc3545",
-            }
-            v_color = verdict_colors.get(bid_info['verdict'], "#6c757d")
-
-            st.markdown(f"""
-            <div class="team-card" style="background: {v_color}; text-align: left;">
-                <p class="metric-big">{bid_info['verdict']}</p>
-                <p>{bid_info['verdict_detail']}</p>
-                <hr style="opacity:0.3">
-                <p>💰 <b>Recommended Max Bid: ₹{bid_info['recommended_max']}L</b> (Hard cap: ₹{bid_info['hard_max']}L)</p>
-                <p>📊 Marginal Value: <b>+{bid_info['marginal_value']} OVR</b> | Need Premium: {bid_info['need_premium']} | Tier Bonus: {bid_info['tier_premium']}</p>
-                <p>📈 Without: {bid_info['baseline_ovr']} OVR → With: {bid_info['boosted_ovr']} OVR</p>
-            </div>
-            """, unsafe_allow_html=True)
-
-            # Player stats
-            st.markdown("")
-            det1, det2, det3, det4 = st.columns(4)
-            det1.metric("🏏 Batting", sel_p['batting'])
-            det2.metric("🎳 Bowling", sel_p['bowling'])
-            det3.metric("🧤 Fielding", sel_p['fielding'])
-            det4.metric("📊 Overall", sel_p['overall'])
+            rec_df = pd.DataFrame.from_records(recs)
+            st.dataframe(_display_df({
+                "Rank": _rank(rec_df),
+                "Player": rec_df["name"],
+                "Role": rec_df["role"],
+                "Tier": rec_df["tier"],
+                "OVR": rec_df["overall"],
+                "Score": rec_df["score"],
+                "Max Bid (₹L)": rec_df["recommended_max"],
+                "Verdict": rec_df["verdict"],
+                "In Optimal": np.where(rec_df["in_optimal"], "⭐", ""),
+            }), use_container_width=True, hide_index=True)
+
+            player_analysis_panel(my_team, recs)
 
     elif auc_slots_left == 0:
         st.success("🎉 Squad complete! You have all 11 players.")
@@ -776,17 +1308,15 @@ with tab5:
     st.markdown("*At every point in the auction, here's the best team you can build.*")
 
     bt_team = "Abhijeet"
-    bt_squad = get_full_squad(bt_team)
-    bt_remaining = get_team_remaining(bt_team)
-    bt_auc_count = get_auction_count(bt_team)
-    bt_slots_left = AUCTION_SLOTS - bt_auc_count
+    bt_ctx = get_team_context(bt_team)
+    bt_squad = bt_ctx["squad"]
+    bt_remaining = bt_ctx["remaining"]
+    bt_slots_left = bt_ctx["slots_left"]
     bt_unsold = get_unsold_players()
     bt_all_teams = build_all_teams_data()
 
     if bt_slots_left > 0 and bt_unsold:
-        snapshot = build_best_team_snapshot(
-            bt_squad, bt_unsold, bt_remaining, bt_slots_left, bt_all_teams
-        )
+        snapshot = get_best_team_snapshot(bt_team)
 
         # Overview metrics
         st.markdown("### 📊 Team Rating Forecast")
@@ -806,19 +1336,7 @@ with tab5:
         st.markdown("### ⭐ Best Possible Dream 11")
         st.caption("If you get all optimal picks at base price — the mathematically best squad.")
         if snapshot["optimal_picks"]:
-            dream_data = []
-            for i, p in enumerate(sorted(snapshot["best_possible_squad"],
-                                         key=lambda x: -x["overall"]), 1):
-                tag = p.get("tag", "")
-                status = "✅ In Squad" if tag else "🎯 Target"
-                can_b = "✅" if p.get("bowling", 0) >= 4 else "❌"
-                dream_data.append({
-                    "#": i, "Name": p["name"], "Role": p["role"],
-                    "Tier": f"⭐{p['tier']}", "OVR": p["overall"],
-                    "Bat": p["batting"], "Bowl": p["bowling"],
-                    "Field": p["fielding"], "Can Bowl": can_b, "Status": status,
-                })
-            st.dataframe(pd.DataFrame(dream_data), use_container_width=True, hide_index=True)
+            st.dataframe(build_dream_team_df(bt_team), use_container_width=True, hide_index=True)
         else:
             st.info("No feasible optimal squad found.")
 
@@ -828,32 +1346,7 @@ with tab5:
         st.markdown("### 🏟️ Realistic Team (Competition-Adjusted)")
         st.caption("Accounts for other teams' likely bids — who you can realistically get.")
         if snapshot["realistic_picks"]:
-            real_data = []
-            for i, p in enumerate(sorted(snapshot["realistic_squad"],
-                                         key=lambda x: -x["overall"]), 1):
-                tag = p.get("tag", "")
-                if tag:
-                    status = f"✅ {tag}"
-                    est_cost = "Fixed"
-                    comp = "—"
-                    prob = "—"
-                elif "estimated_cost" in p:
-                    status = "🎯 Target"
-                    est_cost = f"₹{p['estimated_cost']}L"
-                    comp = p.get("competition_level", "—")
-                    prob = f"{int(p.get('acq_probability', 0) * 100)}%"
-                else:
-                    status = "✅ Bought"
-                    est_cost = f"₹{p.get('sold_price', 0)}L"
-                    comp = "—"
-                    prob = "—"
-                real_data.append({
-                    "#": i, "Name": p["name"], "Role": p["role"],
-                    "Tier": p["tier"], "OVR": p["overall"],
-                    "Est. Cost": est_cost, "Competition": comp,
-                    "Chance": prob, "Status": status,
-                })
-            st.dataframe(pd.DataFrame(real_data), use_container_width=True, hide_index=True)
+            st.dataframe(build_realistic_team_df(bt_team), use_container_width=True, hide_index=True)
 
         st.divider()
 
@@ -861,19 +1354,16 @@ with tab5:
         st.markdown("### 🎯 Priority Targets (Top 10)")
         st.caption("Players ranked by expected value — factoring in quality AND likelihood of acquisition.")
         if snapshot["priority_targets"]:
-            pt_data = []
-            for i, t in enumerate(snapshot["priority_targets"], 1):
-                in_opt = "⭐" if t["in_optimal"] else ""
-                pt_data.append({
-                    "Rank": i, "Name": t["name"], "Role": t["role"],
-                    "Tier": t["tier"], "OVR": t["overall"],
-                    "Est. Price": f"₹{t['estimated_cost']}L",
-                    "Competition": t["competition"],
-                    "Chance": f"{int(t['acq_probability'] * 100)}%",
-                    "Value Score": t["value_score"],
-                    "In Optimal": in_opt,
-                })
-            st.dataframe(pd.DataFrame(pt_data), use_container_width=True, hide_index=True)
+            pt = pd.DataFrame.from_records(snapshot["priority_targets"])
+            st.dataframe(_display_df({
+                "Rank": _rank(pt), "Name": pt["name"], "Role": pt["role"],
+                "Tier": pt["tier"], "OVR": pt["overall"],
+                "Est. Price": "₹" + pt["estimated_cost"].astype(str) + "L",
+                "Competition": pt["competition"],
+                "Chance": (pt["acq_probability"] * 100).astype(int).astype(str) + "%",
+                "Value Score": pt["value_score"],
+                "In Optimal": np.where(pt["in_optimal"], "⭐", ""),
+            }), use_container_width=True, hide_index=True)
 
         st.divider()
 
@@ -881,20 +1371,17 @@ with tab5:
         st.markdown("### 💰 Budget Allocation Strategy")
         st.caption(f"How to spend your remaining ₹{bt_remaining}L across {bt_slots_left} slots.")
         if snapshot["budget_allocation"]:
-            alloc_data = []
-            for a in snapshot["budget_allocation"]:
-                alloc_data.append({
-                    "Slot": a["slot"], "Type": a["type"],
-                    "Target Role": a["target_role"],
-                    "Max Budget": f"₹{a['max_budget']}L",
-                    "Strategy": a["strategy"],
-                })
-            st.dataframe(pd.DataFrame(alloc_data), use_container_width=True, hide_index=True)
-
-            total_priority = sum(a["max_budget"] for a in snapshot["budget_allocation"]
-                                 if a["type"] == "🎯 Priority")
-            total_value = sum(a["max_budget"] for a in snapshot["budget_allocation"]
-                             if a["type"] == "💰 Value")
+            alloc = pd.DataFrame.from_records(snapshot["budget_allocation"])
+            st.dataframe(pd.DataFrame({
+                "Slot": alloc["slot"], "Type": alloc["type"],
+                "Target Role": alloc["target_role"],
+                "Max Budget": "₹" + alloc["max_budget"].astype(str) + "L",
+                "Strategy": alloc["strategy"],
+            }), use_container_width=True, hide_index=True)
+
+            type_totals = alloc.groupby("type")["max_budget"].sum()
+            total_priority = int(type_totals.get("🎯 Priority", 0))
+            total_value = int(type_totals.get("💰 Value", 0))
             total_allocated = total_priority + total_value
             reserve = bt_remaining - total_allocated
             st.markdown(
@@ -907,98 +1394,72 @@ with tab5:
         st.divider()
         if st.button("🤖 Get AI Best Team Analysis", key="ai_best_team", use_container_width=True):
             with st.spinner("🤖 Analyzing with Qwen2.5:7b..."):
-                bt_needs = analyze_squad_needs(bt_squad)
-                insight = get_best_team_analysis(
-                    bt_squad, bt_unsold, bt_remaining, bt_slots_left,
-                    bt_needs, snapshot["optimal_picks"], bt_all_teams
-                )
+                bt_needs = get_squad_needs(bt_team)
                 st.markdown("### 🤖 AI Team Building Strategy")
-                st.markdown(insight)
+                st.write_stream(_ai().get_best_team_analysis(
+                    bt_squad, bt_unsold, bt_remaining, bt_slots_left,
+                    bt_needs, snapshot["optimal_picks"], bt_all_teams,
+                    stream=True,
+                ))
 
     elif bt_slots_left == 0:
         st.success("🎉 Your squad is complete! All 11 players selected.")
         st.markdown("### 📊 Final Squad")
-        final_data = []
-        for i, p in enumerate(sorted(bt_squad, key=lambda x: -x["overall"]), 1):
-            tag = p.get("tag", "Auction")
-            price = f"₹{p.get('sold_price', 0)}L" if p.get("sold_price", 0) > 0 else "Fixed"
-            final_data.append({
-                "#": i, "Name": p["name"], "Role": p["role"],
-                "Tier": p["tier"], "OVR": p["overall"],
-                "Bat": p["batting"], "Bowl": p["bowling"],
-                "Field": p["fielding"], "Type": tag, "Price": price,
-            })
-        st.dataframe(pd.DataFrame(final_data), use_container_width=True, hide_index=True)
-        total_ovr = sum(p["overall"] for p in bt_squad)
-        avg_ovr = round(total_ovr / len(bt_squad), 1)
-        st.metric("Squad Total OVR", total_ovr)
-        st.metric("Squad Avg OVR", avg_ovr)
+        st.dataframe(build_final_squad_df(bt_team), use_container_width=True, hide_index=True)
+        fs1, fs2 = st.columns(2)
+        fs1.metric("Squad Total OVR", team_total_overall(bt_team))
+        fs2.metric("Squad Avg OVR", team_avg_overall(bt_team))
     else:
         st.info("No unsold players remaining.")
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # TAB 6 — AI INSIGHTS (Ollama + Qwen2.5:7b)
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-with tab6:
-    st.markdown("## 🤖 AI Insights — Powered by Ollama (Qwen2.5:7b)")
-    st.markdown("*Local AI analysis using Alibaba's Qwen2.5 model via Ollama.*")
-
-    # Ollama status check
-    ollama_ok, ollama_msg = check_ollama_status()
-    if ollama_ok:
-        st.success(ollama_msg)
-    else:
-        st.error(ollama_msg)
-        st.markdown("""
-        ### ⚙️ Setup Instructions
-        1. **Install Ollama:** `brew install ollama` (macOS)
-        2. **Pull the model:** `ollama pull qwen2.5:7b`
-        3. **Start Ollama:** `ollama serve`
-        4. **Refresh this page**
-        """)
-
-    st.divider()
-
-    ai_team = "Abhijeet"
-    ai_squad = get_full_squad(ai_team)
-    ai_remaining = get_team_remaining(ai_team)
-    ai_slots_left = AUCTION_SLOTS - get_auction_count(ai_team)
+@st.fragment
+def ai_bid_advisor_panel(ai_team):
+    """AI Bid Advisor section; a fragment, so switching players reruns only this."""
+    ai_ctx = get_team_context(ai_team)
+    ai_squad = ai_ctx["squad"]
+    ai_remaining = ai_ctx["remaining"]
+    ai_slots_left = ai_ctx["slots_left"]
     ai_unsold = get_unsold_players()
-    ai_all_teams = build_all_teams_data()
-    ai_needs = analyze_squad_needs(ai_squad)
 
     # ── Section 1: Bid Advisor ──
     st.markdown("### 🎯 AI Bid Advisor")
     st.caption("Select any unsold player to get AI-powered bid advice.")
 
     if ai_unsold and ai_slots_left > 0:
-        ai_player_opts = {
-            f"{p['name']} (Tier {p['tier']} | {p['role']} | OVR {p['overall']})": p["id"]
-            for p in sorted(ai_unsold, key=lambda x: -x["overall"])
-        }
+        ai_player_opts = get_ai_player_options()[0]
         ai_sel_label = st.selectbox("Select Player for AI Analysis",
                                     list(ai_player_opts.keys()), key="ai_bid_player")
         ai_sel_id = ai_player_opts[ai_sel_label]
-        ai_sel_player = next(p for p in ai_unsold if p["id"] == ai_sel_id)
+        ai_sel_player = st.session_state.player_by_id[ai_sel_id]
 
         if st.button("🤖 Get AI Bid Advice", key="ai_bid_btn", use_container_width=True):
             with st.spinner("🤖 Analyzing with Qwen2.5:7b... (may take 15-30 seconds)"):
                 optimizer_rec = recommend_max_bid(
                     ai_sel_player, ai_squad, ai_unsold, ai_remaining, ai_slots_left
                 )
-                advice = get_bid_advice(
-                    ai_sel_player, ai_squad, ai_unsold, ai_remaining, ai_slots_left,
-                    ai_needs, optimizer_rec, ai_all_teams
-                )
                 st.markdown(f"### 🤖 AI Bid Advice for {ai_sel_player['name']}")
-                st.markdown(advice)
+                st.write_stream(_ai().get_bid_advice(
+                    ai_sel_player, ai_squad, ai_unsold, ai_remaining, ai_slots_left,
+                    get_squad_needs(ai_team), optimizer_rec, build_all_teams_data(),
+                    stream=True,
+                ))
     else:
         if ai_slots_left == 0:
             st.success("Your squad is complete!")
         else:
             st.info("No unsold players available.")
 
-    st.divider()
+
+@st.fragment
+def ai_comparison_panel(ai_team):
+    """AI Player Comparison section; a fragment like ai_bid_advisor_panel."""
+    ai_ctx = get_team_context(ai_team)
+    ai_squad = ai_ctx["squad"]
+    ai_remaining = ai_ctx["remaining"]
+    ai_unsold = get_unsold_players()
 
     # ── Section 2: Player Comparison ──
     st.markdown("### ⚖️ AI Player Comparison")
@@ -1006,10 +1467,7 @@ with tab6:
 
     if len(ai_unsold) >= 2:
         cmp_col1, cmp_col2 = st.columns(2)
-        cmp_opts = {
-            f"{p['name']} ({p['role']} | T{p['tier']})": p["id"]
-            for p in sorted(ai_unsold, key=lambda x: -x["overall"])
-        }
+        cmp_opts = get_ai_player_options()[1]
         with cmp_col1:
             cmp1_label = st.selectbox("Player 1", list(cmp_opts.keys()), key="cmp1")
             cmp1_id = cmp_opts[cmp1_label]
@@ -1020,11 +1478,48 @@ with tab6:
 
         if st.button("🤖 Compare Players", key="ai_cmp_btn", use_container_width=True):
             with st.spinner("🤖 Comparing players..."):
-                p1 = next(p for p in ai_unsold if p["id"] == cmp1_id)
-                p2 = next(p for p in ai_unsold if p["id"] == cmp2_id)
-                comparison = get_player_comparison(p1, p2, ai_squad, ai_needs, ai_remaining)
+                p1 = st.session_state.player_by_id[cmp1_id]
+                p2 = st.session_state.player_by_id[cmp2_id]
                 st.markdown(f"### ⚖️ {p1['name']} vs {p2['name']}")
-                st.markdown(comparison)
+                st.write_stream(_ai().get_player_comparison(
+                    p1, p2, ai_squad, get_squad_needs(ai_team), ai_remaining, stream=True
+                ))
+
+
+with tab6:
+    st.markdown("## 🤖 AI Insights — Powered by Ollama (Qwen2.5:7b)")
+    st.markdown("*Local AI analysis using Alibaba's Qwen2.5 model via Ollama.*")
+
+    # Ollama status check
+    ollama_ok, ollama_msg = _ai().check_ollama_status()
+    if ollama_ok:
+        st.success(ollama_msg)
+    else:
+        st.error(ollama_msg)
+        st.markdown("""
+        ### ⚙️ Setup Instructions
+        1. **Install Ollama:** `brew install ollama` (macOS)
+        2. **Pull the model:** `ollama pull qwen2.5:7b`
+        3. **Start Ollama:** `OLLAMA_NUM_PARALLEL=4 OLLAMA_KEEP_ALIVE=30m ollama serve`
+        4. **Refresh this page**
+        """)
+
+    st.divider()
+
+    ai_team = "Abhijeet"
+    ai_ctx = get_team_context(ai_team)
+    ai_squad = ai_ctx["squad"]
+    ai_remaining = ai_ctx["remaining"]
+    ai_slots_left = ai_ctx["slots_left"]
+    ai_unsold = get_unsold_players()
+    # All-teams data, squad needs and the optimal squad are fetched inside the
+    # button branches only, so plain reruns of this tab skip them
+
+    ai_bid_advisor_panel(ai_team)
+
+    st.divider()
+
+    ai_comparison_panel(ai_team)
 
     st.divider()
 
@@ -1034,9 +1529,10 @@ with tab6:
 
     if st.button("🤖 Generate Power Rankings", key="ai_power_btn", use_container_width=True):
         with st.spinner("🤖 Analyzing all teams..."):
-            review = get_post_auction_review(ai_squad, ai_remaining, ai_needs, ai_all_teams)
             st.markdown("### 🏆 AI Power Rankings")
-            st.markdown(review)
+            st.write_stream(_ai().get_post_auction_review(
+                ai_squad, ai_remaining, get_squad_needs(ai_team), build_all_teams_data(), stream=True
+            ))
 
     st.divider()
 
@@ -1047,16 +1543,48 @@ with tab6:
     if ai_unsold and ai_slots_left > 0:
         if st.button("🤖 Generate Full Strategy", key="ai_strategy_btn", use_container_width=True):
             with st.spinner("🤖 Building comprehensive strategy... (may take 30-60 seconds)"):
-                optimal = solve_optimal_squad(ai_unsold, ai_squad, ai_remaining, ai_slots_left)
-                strategy = get_best_team_analysis(
-                    ai_squad, ai_unsold, ai_remaining, ai_slots_left,
-                    ai_needs, optimal if optimal else [], ai_all_teams
-                )
+                optimal = get_best_team_snapshot(ai_team)["optimal_picks"]
                 st.markdown("### 📋 Full AI Strategy")
-                st.markdown(strategy)
+                st.write_stream(_ai().get_best_team_analysis(
+                    ai_squad, ai_unsold, ai_remaining, ai_slots_left,
+                    get_squad_needs(ai_team), optimal, build_all_teams_data(),
+                    stream=True,
+                ))
     else:
         st.info("Strategy brief available when there are unsold players and open slots.")
 
+    st.divider()
+
+    # ── Section 5: Combined Dashboard ──
+    st.markdown("### 🗂️ AI Auction Dashboard")
+    st.caption("Power rankings and strategy brief generated side by side in one go.")
+
+    if ai_unsold and ai_slots_left > 0:
+        if st.button("🤖 Generate Dashboard", key="ai_dashboard_btn", use_container_width=True):
+            with st.spinner("🤖 Running both analyses in parallel... (may take 30-60 seconds)"):
+                optimal = get_best_team_snapshot(ai_team)["optimal_picks"]
+                review_text, strategy_text = _ai().run_insights_parallel([
+                    (_ai().get_post_auction_review, dict(
+                        my_squad=ai_squad, budget_remaining=ai_remaining,
+                        squad_needs=get_squad_needs(ai_team), all_teams_data=build_all_teams_data(),
+                    )),
+                    (_ai().get_best_team_analysis, dict(
+                        my_squad=ai_squad, unsold_players=ai_unsold,
+                        budget_remaining=ai_remaining, slots_left=ai_slots_left,
+                        squad_needs=get_squad_needs(ai_team), optimal_picks=optimal,
+                        all_teams_data=build_all_teams_data(),
+                    )),
+                ])
+            dash_col1, dash_col2 = st.columns(2)
+            with dash_col1:
+                st.markdown("### 🏆 AI Power Rankings")
+                st.markdown(review_text)
+            with dash_col2:
+                st.markdown("### 📋 Full AI Strategy")
+                st.markdown(strategy_text)
+    else:
+        st.info("Dashboard available when there are unsold players and open slots.")
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # TAB 7 — TIER ANALYSIS
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -1065,21 +1593,7 @@ with tab7:
 
     # Overall tier distribution
     st.markdown("### 🌐 All 44 Players by Tier")
-    tier_summary = {"Tier": [], "Count": [], "Players": []}
-    for t in [1, 2, 3, 4]:
-        tp = [p for p in st.session_state.player_data if p["tier"] == t]
-        tier_summary["Tier"].append(f"Tier {t}")
-        tier_summary["Count"].append(len(tp))
-        names = []
-        for p in sorted(tp, key=lambda x: -x["overall"]):
-            tag = ""
-            if p.get("tag") == "Captain":
-                tag = " 🏅C"
-            elif p.get("tag") == "Vice-Captain":
-                tag = " 🥈VC"
-            names.append(f"{p['name']}{tag}")
-        tier_summary["Players"].append(", ".join(names))
-    st.dataframe(pd.DataFrame(tier_summary), use_container_width=True, hide_index=True)
+    st.dataframe(build_tier_summary_df(), use_container_width=True, hide_index=True)
 
     st.divider()
 
@@ -1089,15 +1603,17 @@ with tab7:
     for idx, (tname, tinfo) in enumerate(TEAMS.items()):
         with tier_team_cols[idx]:
             st.markdown(f"#### {tinfo['emoji']} {tname}")
-            squad = get_full_squad(tname)
+            squad = get_team_context(tname)["squad"]
             if not squad:
                 st.caption("Only captain & VC (no auction buys)")
 
-            for t in [1, 2, 3, 4]:
-                tp = [p for p in squad if p["tier"] == t]
+            squad_by_tier = {}
+            for p in squad:
+                squad_by_tier.setdefault(p["tier"], []).append(p)
+            for t in TIERS:
+                tp = squad_by_tier.get(t)
                 if tp:
-                    tier_emoji = {1: "🥇", 2: "🥈", 3: "🥉", 4: "🏷️"}[t]
-                    st.markdown(f"**{tier_emoji} Tier {t}** ({len(tp)})")
+                    st.markdown(f"**{TIER_EMOJI[t]} Tier {t}** ({len(tp)})")
                     for p in tp:
                         tag_str = f" [{p['tag']}]" if p.get("tag") else ""
                         st.markdown(f"  • {p['name']}{tag_str} ({p['role']}, OVR {p['overall']})")
@@ -1107,61 +1623,56 @@ with tab7:
     # Tier-wise spending
     st.markdown("### 💰 Tier-wise Spending Analysis")
     if st.session_state.auction_log:
-        spend_data = []
-        for tname in TEAMS:
-            auc_players = get_auction_players(tname)
-            for t in [1, 2, 3, 4]:
-                tp = [p for p in auc_players if p["tier"] == t]
-                total_spend = sum(p["sold_price"] for p in tp)
-                avg_price = round(total_spend / len(tp), 1) if tp else 0
-                spend_data.append({
-                    "Team": tname, "Tier": f"Tier {t}",
-                    "Players": len(tp), "Total Spent": f"₹{total_spend}L",
-                    "Avg Price": f"₹{avg_price}L",
-                })
-        st.dataframe(pd.DataFrame(spend_data), use_container_width=True, hide_index=True)
+        st.dataframe(build_tier_spending_df(), use_container_width=True, hide_index=True)
     else:
         st.info("Spending analysis will appear once auction starts.")
 
     st.divider()
     st.markdown("### 📖 Tier Classification Guide")
-    guide_c1, guide_c2, guide_c3, guide_c4 = st.columns(4)
-    with guide_c1:
-        st.markdown("""
-        <div class="team-card tier-1">
-            <p class="metric-big">🥇 Tier 1</p>
-            <p>OVR ≥ 7.5 or Captain/VC</p>
-            <p class="metric-label">Elite — bid aggressively</p>
-        </div>
-        """, unsafe_allow_html=True)
-    with guide_c2:
-        st.markdown("""
-        <div class="team-card tier-2">
-            <p class="metric-big">🥈 Tier 2</p>
-            <p>OVR ≥ 5.5</p>
-            <p class="metric-label">Strong — solid value</p>
-        </div>
-        """, unsafe_allow_html=True)
-    with guide_c3:
-        st.markdown("""
-        <div class="team-card tier-3">
-            <p class="metric-big">🥉 Tier 3</p>
-            <p>OVR ≥ 3.5</p>
-            <p class="metric-label">Decent — fill gaps</p>
-        </div>
-        """, unsafe_allow_html=True)
-    with guide_c4:
-        st.markdown("""
-        <div class="team-card tier-4">
-            <p class="metric-big">🏷️ Tier 4</p>
-            <p>OVR &lt; 3.5</p>
-            <p class="metric-label">Budget — base price</p>
-        </div>
-        """, unsafe_allow_html=True)
+    st.markdown(TIER_GUIDE_HTML, unsafe_allow_html=True)
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # TAB 8 — EDIT PLAYER RATINGS
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+@st.fragment
+def quick_edit_panel():
+    """Single-player editor.
+
+    Runs as a fragment: picking a player or moving a slider reruns only this
+    panel. Saving calls st.rerun(), which reruns the whole app.
+    """
+    st.markdown("### 🎯 Quick Edit (Single Player)")
+    player_names = get_edit_player_options()
+    selected_name = st.selectbox("Select Player", list(player_names.keys()), key="edit_select")
+    sel_player = st.session_state.player_by_id[player_names[selected_name]]
+
+    qe1, qe2, qe3 = st.columns(3)
+    with qe1:
+        new_batting = st.slider("🏏 Batting", 0, 10, sel_player["batting"], key="qe_bat")
+    with qe2:
+        new_bowling = st.slider("🎳 Bowling", 0, 10, sel_player["bowling"], key="qe_bowl")
+    with qe3:
+        new_fielding = st.slider("🧤 Fielding", 0, 10, sel_player["fielding"], key="qe_field")
+
+    preview = {**sel_player, "batting": new_batting, "bowling": new_bowling, "fielding": new_fielding}
+    preview_ovr = compute_overall(preview)
+    preview_tier = classify_tier(preview)
+    preview_role = classify_role(preview)
+
+    pc1, pc2 = st.columns(2)
+    with pc1:
+        st.markdown(f"**Current:** Role `{sel_player['role']}` | OVR `{sel_player['overall']}` | Tier `{sel_player['tier']}`")
+    with pc2:
+        changed = (new_batting != sel_player["batting"] or new_bowling != sel_player["bowling"] or new_fielding != sel_player["fielding"])
+        st.markdown(f"**Preview {'🔄' if changed else '✅'}:** Role `{preview_role}` | OVR `{preview_ovr}` | Tier `{preview_tier}`")
+
+    if st.button("💾 Save This Player", use_container_width=True):
+        update_player_ratings(sel_player, new_batting, new_bowling, new_fielding)
+        bump_ratings_version()
+        st.success(f"✅ {sel_player['name']} → Tier {sel_player['tier']} | {sel_player['role']} | OVR {sel_player['overall']}")
+        st.rerun()
+
+
 with tab8:
     st.markdown("## ✏️ Edit Player Ratings")
     st.markdown("*Update batting, bowling & fielding ratings. Tier and role auto-recalculate.*")
@@ -1196,18 +1707,15 @@ with tab8:
     )
 
     if st.button("💾 Save All Rating Changes", type="primary", use_container_width=True):
-        changes = 0
-        for _, row in edited_df.iterrows():
-            pid = int(row["ID"])
-            player = next(p for p in st.session_state.player_data if p["id"] == pid)
-            new_bat, new_bowl, new_field = int(row["Batting"]), int(row["Bowling"]), int(row["Fielding"])
-            if player["batting"] != new_bat or player["bowling"] != new_bowl or player["fielding"] != new_field:
-                player["batting"] = new_bat
-                player["bowling"] = new_bowl
-                player["fielding"] = new_field
-                recalc_player(player)
-                changes += 1
+        rating_cols = ["Batting", "Bowling", "Fielding"]
+        changed = (edited_df[rating_cols] != edit_df[rating_cols]).any(axis=1)
+        changed_rows = edited_df.loc[changed, ["ID"] + rating_cols].to_numpy().tolist()
+        for pid, new_bat, new_bowl, new_field in changed_rows:
+            player = st.session_state.player_by_id[int(pid)]
+            update_player_ratings(player, int(new_bat), int(new_bowl), int(new_field))
+        changes = len(changed_rows)
         if changes:
+            bump_ratings_version()
             st.success(f"✅ Updated {changes} player(s). Tiers & roles recalculated!")
             st.rerun()
         else:
@@ -1215,39 +1723,7 @@ with tab8:
 
     st.divider()
 
-    # Quick edit
-    st.markdown("### 🎯 Quick Edit (Single Player)")
-    player_names = {f"{p['name']} ({p.get('tag', 'Auction')})": p["id"] for p in st.session_state.player_data}
-    selected_name = st.selectbox("Select Player", list(player_names.keys()), key="edit_select")
-    sel_player = next(p for p in st.session_state.player_data if p["id"] == player_names[selected_name])
-
-    qe1, qe2, qe3 = st.columns(3)
-    with qe1:
-        new_batting = st.slider("🏏 Batting", 0, 10, sel_player["batting"], key="qe_bat")
-    with qe2:
-        new_bowling = st.slider("🎳 Bowling", 0, 10, sel_player["bowling"], key="qe_bowl")
-    with qe3:
-        new_fielding = st.slider("🧤 Fielding", 0, 10, sel_player["fielding"], key="qe_field")
-
-    preview = {**sel_player, "batting": new_batting, "bowling": new_bowling, "fielding": new_fielding}
-    preview_ovr = compute_overall(preview)
-    preview_tier = classify_tier(preview)
-    preview_role = classify_role(preview)
-
-    pc1, pc2 = st.columns(2)
-    with pc1:
-        st.markdown(f"**Current:** Role `{sel_player['role']}` | OVR `{sel_player['overall']}` | Tier `{sel_player['tier']}`")
-    with pc2:
-        changed = (new_batting != sel_player["batting"] or new_bowling != sel_player["bowling"] or new_fielding != sel_player["fielding"])
-        st.markdown(f"**Preview {'🔄' if changed else '✅'}:** Role `{preview_role}` | OVR `{preview_ovr}` | Tier `{preview_tier}`")
-
-    if st.button("💾 Save This Player", use_container_width=True):
-        sel_player["batting"] = new_batting
-        sel_player["bowling"] = new_bowling
-        sel_player["fielding"] = new_fielding
-        recalc_player(sel_player)
-        st.success(f"✅ {sel_player['name']} → Tier {sel_player['tier']} | {sel_player['role']} | OVR {sel_player['overall']}")
-        st.rerun()
+    quick_edit_panel()
 
     # Download all teams
     st.divider()
@@ -1255,10 +1731,10 @@ with tab8:
     dl_cols = st.columns(4)
     for idx, tname in enumerate(TEAMS):
         with dl_cols[idx]:
-            csv = build_team_csv(tname)
+            csv_data = build_team_csv(tname)
             st.download_button(
                 label=f"📥 {tname}",
-                data=csv,
+                data=csv_data,
                 file_name=f"{tname}_squad.csv",
                 mime="text/csv",
                 use_container_width=True,
@@ -1,7 +1,8 @@
 """
 🧠 CricBazaar — Squad Optimizer & Recommendation Engine
-Uses MILP (Mixed Integer Linear Programming) via scipy.optimize.milp
-to recommend optimal squad picks and max bid prices for Abhijeet.
+Models squad selection as a MILP (Mixed Integer Linear Programming),
+solved exactly in closed form, to recommend optimal squad picks and
+max bid prices for Abhijeet.
 
 Constraints:
   - Must pick exactly `slots_left` players from unsold pool
@@ -18,15 +19,15 @@ Enhanced with:
   - Budget-aware recommendations considering future players
 """
 
-from scipy.optimize import linprog
+from collections import Counter
 import numpy as np
-from players import BASE_PRICE, AUCTION_SLOTS, BUDGET_PER_TEAM, compute_overall
+from players import BASE_PRICE, BID_INCREMENT, AUCTION_SLOTS, BUDGET_PER_TEAM, compute_overall
 
 
 # ── Helpers ──────────────────────────────────────────────────────────
-def _can_bowl(player):
-    """A player can bowl if bowling rating >= 4."""
-    return player["bowling"] >= 4
+# Per-tier lookup tables indexed by tier number (index 0 unused)
+_TIER_BONUS = np.array([0.0, 2.0, 1.0, 0.3, 0.0])    # value-score bonus
+_TIER_PREMIUM = np.array([0, 8, 4, 1, 0])            # max-bid premium (₹L)
 
 
 def _player_value_score(player, squad_needs):
@@ -45,21 +46,58 @@ def _player_value_score(player, squad_needs):
 
     # Bowling contribution: premium for bowlers when team needs bowling
     bowl_bonus = 0
-    if "need_bowlers" in squad_needs and _can_bowl(player):
+    if "need_bowlers" in squad_needs and player["can_bowl"]:
         bowl_bonus = player["bowling"] * 0.3
 
     # Tier bonus
-    tier_bonus = {1: 2.0, 2: 1.0, 3: 0.3, 4: 0.0}.get(player["tier"], 0)
+    tier_bonus = float(_TIER_BONUS[player["tier"]])
 
     return round(overall * 0.4 * need_mult + bowl_bonus * 0.2 + tier_bonus * 0.1, 2)
 
 
+def _pool_arrays(players):
+    """
+    Parallel NumPy arrays (ids, overall, bowling, tiers, roles, can_bowl)
+    for a list of player dicts, so pool-wide maths needn't re-read the dicts.
+    """
+    n = len(players)
+    return {
+        "ids": np.fromiter((p["id"] for p in players), dtype=int, count=n),
+        "overall": np.fromiter((p["overall"] for p in players), dtype=float, count=n),
+        # Ratings are 0-10 and tiers 1-4, so a byte each is plenty
+        "bowling": np.fromiter((p["bowling"] for p in players), dtype=np.int8, count=n),
+        "tiers": np.fromiter((p["tier"] for p in players), dtype=np.int8, count=n),
+        "roles": np.array([p["role"] for p in players], dtype=str),
+        "can_bowl": np.fromiter((p["can_bowl"] for p in players), dtype=bool, count=n),
+    }
+
+
+def _player_value_scores(overall, bowling, tiers, roles, squad_needs):
+    """
+    Vectorized _player_value_score over parallel arrays of a player pool.
+    Returns a float ndarray of unrounded scores.
+    """
+    need_mult = np.where(np.isin(roles, list(squad_needs)), 1.5, 1.0)
+    if "need_bowlers" in squad_needs:
+        bowl_bonus = np.where(bowling >= 4, bowling * 0.3, 0.0)
+    else:
+        bowl_bonus = 0.0
+    return overall * 0.4 * need_mult + bowl_bonus * 0.2 + _TIER_BONUS[tiers] * 0.1
+
+
 def analyze_squad_needs(my_squad):
     """Analyze what the current squad is missing."""
-    bowlers_who_can_bowl = sum(1 for p in my_squad if _can_bowl(p))
-    bat_count = sum(1 for p in my_squad if p["role"] == "Batsman")
-    bowl_count = sum(1 for p in my_squad if p["role"] == "Bowler")
-    ar_count = sum(1 for p in my_squad if p["role"] == "All-rounder")
+    bowlers_who_can_bowl = bat_count = bowl_count = ar_count = 0
+    for p in my_squad:
+        if p["can_bowl"]:
+            bowlers_who_can_bowl += 1
+        role = p["role"]
+        if role == "Batsman":
+            bat_count += 1
+        elif role == "Bowler":
+            bowl_count += 1
+        elif role == "All-rounder":
+            ar_count += 1
 
     needs = set()
     if bowlers_who_can_bowl < 6:
@@ -83,11 +121,13 @@ def analyze_squad_needs(my_squad):
 
 def solve_optimal_squad(unsold_players, my_squad, budget_remaining, slots_left):
     """
-    MILP solver to find the optimal set of `slots_left` players from
-    `unsold_players` that maximizes total overall rating subject to
-    budget and bowling constraints.
+    Find the optimal set of `slots_left` players from `unsold_players` that
+    maximizes total overall rating subject to budget and bowling constraints.
 
-    Uses scipy.optimize.linprog with integrality constraints (MILP).
+    This is the squad MILP (x_i ∈ {0, 1}, Σ x_i = slots_left,
+    Σ(BASE_PRICE * x_i) ≤ budget, Σ(can_bowl_i * x_i) ≥ bowlers needed),
+    but with every pick costing BASE_PRICE it has an exact closed form, so
+    no solver is needed — see _best_with_bowlers.
 
     Returns:
         list of dicts: selected players with metadata, or empty list if infeasible.
@@ -96,63 +136,66 @@ def solve_optimal_squad(unsold_players, my_squad, budget_remaining, slots_left):
     if n == 0 or slots_left <= 0:
         return []
 
+    # Every pick costs BASE_PRICE, so with exactly slots_left picks the
+    # budget constraint is all-or-nothing
+    if slots_left * BASE_PRICE > budget_remaining or slots_left > n:
+        return []
+
     # Current squad bowling count
-    current_bowlers = sum(1 for p in my_squad if _can_bowl(p))
+    current_bowlers = sum(1 for p in my_squad if p["can_bowl"])
     bowlers_still_needed = max(0, 6 - current_bowlers)
 
-    # Decision variables: x_i ∈ {0, 1} for each unsold player
-    # Objective: maximize Σ(overall_i * x_i) → minimize Σ(-overall_i * x_i)
-    overalls = np.array([p["overall"] for p in unsold_players])
-    c = -overalls  # negate for minimization
-
-    # Constraint 1: exactly slots_left players selected
-    # Σ x_i = slots_left → as two inequalities: Σ x_i <= slots_left AND Σ -x_i <= -slots_left
-    A_eq = np.ones((1, n))
-    b_eq = np.array([slots_left])
-
-    # Inequality constraints (A_ub @ x <= b_ub)
-    A_ub_list = []
-    b_ub_list = []
-
-    # Constraint 2: budget → Σ(BASE_PRICE * x_i) <= budget_remaining
-    # (conservative: assume each picked player costs at least BASE_PRICE)
-    costs = np.full(n, BASE_PRICE)
-    A_ub_list.append(costs)
-    b_ub_list.append(budget_remaining)
-
-    # Constraint 3: at least `bowlers_still_needed` bowlers among selected
-    # Σ(can_bowl_i * x_i) >= bowlers_still_needed
-    # → Σ(-can_bowl_i * x_i) <= -bowlers_still_needed
-    if bowlers_still_needed > 0:
-        can_bowl_vec = np.array([1.0 if _can_bowl(p) else 0.0 for p in unsold_players])
-        A_ub_list.append(-can_bowl_vec)
-        b_ub_list.append(-bowlers_still_needed)
-
-    A_ub = np.array(A_ub_list)
-    b_ub = np.array(b_ub_list)
-
-    # Bounds: 0 <= x_i <= 1
-    bounds = [(0, 1)] * n
-
-    # Integrality: all binary
-    integrality = np.ones(n)
-
-    try:
-        result = linprog(
-            c, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq,
-            bounds=bounds, integrality=integrality,
-            method="highs",
-        )
-        if result.success:
-            selected_indices = [i for i in range(n) if result.x[i] > 0.5]
-            return [unsold_players[i] for i in selected_indices]
-        else:
-            return []
-    except Exception:
+    pool = _pool_arrays(unsold_players)
+
+    # Not enough bowlers left in the pool, or not enough slots, to meet
+    # the requirement
+    if bowlers_still_needed > min(slots_left, int(pool["can_bowl"].sum())):
+        return []
+
+    picks = _best_with_bowlers(pool, slots_left, bowlers_still_needed)
+    return [unsold_players[i] for i in picks]
+
+
+def _best_with_bowlers(pool, slots_left, bowlers_still_needed):
+    """
+    Pool indices of the best `slots_left` players with at least
+    `bowlers_still_needed` bowlers among them, in pool order.
+
+    Take the top bowlers first, then fill the rest by overall. This is
+    exact: any optimal squad missing one of those top bowlers holds a
+    weaker bowler that can be swapped for it without losing the bowling
+    count. Ties go to the earlier player in the pool.
+    """
+    order = np.argsort(-pool["overall"], kind="stable")
+    bowlers = order[pool["can_bowl"][order]][:bowlers_still_needed]
+    taken = np.zeros(len(order), dtype=bool)
+    taken[bowlers] = True
+    rest = order[~taken[order]][:slots_left - len(bowlers)]
+    return np.sort(np.concatenate([bowlers, rest]))
+
+
+def _swap_into_optimum(player, pool_optimal, bowlers_needed):
+    """
+    Best squad of the other len(pool_optimal) - 1 picks to go with `player`,
+    read off the pool-wide optimum instead of re-solving the MILP.
+
+    With every pick costing BASE_PRICE, forcing a player in frees exactly one
+    slot of the optimum: drop its lowest-rated pick that the bowling
+    constraint can spare.
+    """
+    if any(q["id"] == player["id"] for q in pool_optimal):
+        return [q for q in pool_optimal if q["id"] != player["id"]]
+    bowlers_in_optimum = sum(1 for q in pool_optimal if q["can_bowl"])
+    droppable = [q for q in pool_optimal
+                 if player["can_bowl"] or not q["can_bowl"] or bowlers_in_optimum > bowlers_needed]
+    if not droppable:
         return []
+    drop = min(droppable, key=lambda q: q["overall"])
+    return [q for q in pool_optimal if q is not drop]
 
 
-def recommend_max_bid(player, my_squad, unsold_players, budget_remaining, slots_left):
+def recommend_max_bid(player, my_squad, unsold_players, budget_remaining, slots_left,
+                      analysis=None, pool_optimal=None, role_counts=None, available_bowlers=None):
     """
     Recommend the maximum price Abhijeet should pay for a specific player.
 
@@ -167,25 +210,52 @@ def recommend_max_bid(player, my_squad, unsold_players, budget_remaining, slots_
       - Role scarcity in remaining pool → premium
       - Tier of the player → premium
 
+    Callers scoring many players against the same squad can pass the
+    squad's `analysis` and `pool_optimal` (solve_optimal_squad over the
+    whole of `unsold_players`). The boosted squad is then derived from
+    `pool_optimal` by a single swap, and the baseline is only re-solved for
+    players the optimum already uses. `role_counts` (role → count) and
+    `available_bowlers` over `unsold_players` likewise replace the per-call
+    scarcity scans.
+
     Returns:
         dict with recommendation details.
     """
-    analysis = analyze_squad_needs(my_squad)
+    if analysis is None:
+        analysis = analyze_squad_needs(my_squad)
 
     # Hard cap: can't bid more than affordable
     hard_max = budget_remaining - (slots_left - 1) * BASE_PRICE if slots_left > 1 else budget_remaining
 
     # --- Marginal value via MILP ---
-    others = [p for p in unsold_players if p["id"] != player["id"]]
-
-    # Baseline: best team WITHOUT this player
-    baseline_squad = solve_optimal_squad(others, my_squad, budget_remaining, slots_left)
+    # Baseline: best team WITHOUT this player. If the pool-wide optimum
+    # doesn't use the player, it is still optimal once they are removed.
+    # Only the solver paths need the pool minus this player, so `others` is
+    # built here and reused by the boosted solve below (which only runs
+    # when pool_optimal is None, i.e. when this branch was taken).
+    if pool_optimal is not None and all(p["id"] != player["id"] for p in pool_optimal):
+        baseline_squad = pool_optimal
+    else:
+        others = [p for p in unsold_players if p["id"] != player["id"]]
+        baseline_squad = solve_optimal_squad(others, my_squad, budget_remaining, slots_left)
     baseline_ovr = sum(p["overall"] for p in baseline_squad) if baseline_squad else 0
 
     # Boosted: best team WITH this player forced in (slots_left - 1 from others)
-    remaining_budget = budget_remaining - BASE_PRICE
-    boosted_squad = solve_optimal_squad(others, my_squad + [player], remaining_budget, slots_left - 1)
-    boosted_ovr = player["overall"] + sum(p["overall"] for p in boosted_squad) if boosted_squad else 0
+    boosted_ovr = 0
+    if slots_left == 1:
+        # Last slot: the player alone completes the squad, nothing to solve.
+        # Still infeasible if it can't be afforded or leaves bowling short.
+        if budget_remaining >= BASE_PRICE and analysis["bowlers_needed"] <= int(player["can_bowl"]):
+            boosted_ovr = player["overall"]
+    else:
+        if pool_optimal is not None:
+            boosted_squad = _swap_into_optimum(player, pool_optimal, analysis["bowlers_needed"])
+        else:
+            remaining_budget = budget_remaining - BASE_PRICE
+            boosted_squad = solve_optimal_squad(others, my_squad + [player], remaining_budget, slots_left - 1)
+        # An empty result here means the MILP was infeasible
+        if boosted_squad:
+            boosted_ovr = player["overall"] + sum(p["overall"] for p in boosted_squad)
 
     marginal_value = max(0, boosted_ovr - baseline_ovr)
 
@@ -194,22 +264,26 @@ def recommend_max_bid(player, my_squad, unsold_players, budget_remaining, slots_
     role = player["role"]
 
     # Bowling scarcity premium
-    if analysis["bowlers_needed"] > 0 and _can_bowl(player):
+    if analysis["bowlers_needed"] > 0 and player["can_bowl"]:
         # Count how many unsold players can also bowl
-        available_bowlers = sum(1 for p in unsold_players if _can_bowl(p))
+        if available_bowlers is None:
+            available_bowlers = sum(1 for p in unsold_players if p["can_bowl"])
         scarcity = max(0, analysis["bowlers_needed"] - available_bowlers + 1)
         need_premium += scarcity * 3 + player["bowling"] * 0.5
 
     # Role scarcity premium
     if role in analysis["role_needs"]:
-        same_role_available = sum(1 for p in unsold_players if p["role"] == role)
+        if role_counts is not None:
+            same_role_available = role_counts[role]
+        else:
+            same_role_available = sum(1 for p in unsold_players if p["role"] == role)
         if same_role_available <= slots_left:
             need_premium += 5  # scarce role
         else:
             need_premium += 2
 
     # Tier premium
-    tier_premium = {1: 8, 2: 4, 3: 1, 4: 0}.get(player["tier"], 0)
+    tier_premium = int(_TIER_PREMIUM[player["tier"]])
 
     # --- Compute recommended max bid ---
     raw_max = BASE_PRICE + marginal_value * 1.5 + need_premium + tier_premium
@@ -231,7 +305,7 @@ def recommend_max_bid(player, my_squad, unsold_players, budget_remaining, slots_
     elif role in analysis["role_needs"]:
         verdict = "🟡 NEED-BASED BUY"
         verdict_detail = f"Your team needs a {role} — this fills a gap."
-    elif _can_bowl(player) and analysis["bowlers_needed"] > 0:
+    elif player["can_bowl"] and analysis["bowlers_needed"] > 0:
         verdict = "🟡 BOWLING NEED"
         verdict_detail = f"You need {analysis['bowlers_needed']} more bowling options."
     else:
@@ -272,42 +346,55 @@ def get_ranked_recommendations(unsold_players, my_squad, budget_remaining, slots
     optimal_picks = solve_optimal_squad(unsold_players, my_squad, budget_remaining, slots_left)
     optimal_ids = {p["id"] for p in optimal_picks}
 
-    recommendations = []
-    for p in unsold_players:
-        # Value score
-        value = _player_value_score(p, analysis["role_needs"])
+    # Composite scores for the whole pool in one vectorized pass
+    pool = _pool_arrays(unsold_players)
+    roles, can_bowl = pool["roles"], pool["can_bowl"]
+
+    # Value score (rounded like _player_value_score)
+    value = np.round(_player_value_scores(
+        pool["overall"], pool["bowling"], pool["tiers"], roles, analysis["role_needs"]), 2)
+
+    # MILP bonus: if optimizer picked this player
+    in_optimal = np.isin(pool["ids"], list(optimal_ids))
+    milp_bonus = np.where(in_optimal, 5.0, 0.0)
 
-        # MILP bonus: if optimizer picked this player
-        milp_bonus = 5.0 if p["id"] in optimal_ids else 0.0
+    # Bowling need bonus
+    bowl_need_bonus = np.where(can_bowl, analysis["bowlers_needed"] * 2.0, 0.0) \
+        if analysis["bowlers_needed"] > 0 else 0.0
 
-        # Bowling need bonus
-        bowl_need_bonus = 0
-        if analysis["bowlers_needed"] > 0 and _can_bowl(p):
-            bowl_need_bonus = analysis["bowlers_needed"] * 2.0
+    # Role scarcity: players left in the pool with the same role
+    _, role_idx, role_counts = np.unique(roles, return_inverse=True, return_counts=True)
+    same_role = role_counts[role_idx]
+    role_scarcity = np.where(
+        np.isin(roles, list(analysis["role_needs"])),
+        np.maximum(0, 3.0 - same_role * 0.3), 0.0,
+    )
 
-        # Role scarcity
-        role_scarcity = 0
-        if p["role"] in analysis["role_needs"]:
-            same_role = sum(1 for u in unsold_players if u["role"] == p["role"])
-            role_scarcity = max(0, 3.0 - same_role * 0.3)
+    scores = np.round(value + milp_bonus + bowl_need_bonus + role_scarcity, 2)
 
-        # Composite score
-        score = round(value + milp_bonus + bowl_need_bonus + role_scarcity, 2)
+    # Pool-wide counts shared by every recommend_max_bid call below
+    pool_role_counts = Counter(roles.tolist())
+    pool_bowlers = int(can_bowl.sum())
 
+    # Highest score first; a stable sort keeps pool order among ties
+    recommendations = []
+    for i in np.argsort(-scores, kind="stable").tolist():
+        p = unsold_players[i]
         # Quick bid recommendation
-        bid_info = recommend_max_bid(p, my_squad, unsold_players, budget_remaining, slots_left)
+        bid_info = recommend_max_bid(p, my_squad, unsold_players, budget_remaining, slots_left,
+                                     analysis=analysis, pool_optimal=optimal_picks,
+                                     role_counts=pool_role_counts, available_bowlers=pool_bowlers)
 
         recommendations.append({
             **p,
-            "score": score,
-            "in_optimal": p["id"] in optimal_ids,
+            "score": float(scores[i]),
+            "in_optimal": bool(in_optimal[i]),
             "recommended_max": bid_info["recommended_max"],
             "verdict": bid_info["verdict"],
             "verdict_detail": bid_info["verdict_detail"],
             "marginal_value": bid_info["marginal_value"],
         })
 
-    recommendations.sort(key=lambda x: -x["score"])
     return recommendations
 
 
@@ -315,7 +402,42 @@ def get_ranked_recommendations(unsold_players, my_squad, budget_remaining, slots
 # COMPETITIVE BIDDING — Predict what other teams will bid
 # ═══════════════════════════════════════════════════════════════════════
 
-def estimate_competition(player, all_teams_data, unsold_players):
+def _rival_profiles(all_teams_data):
+    """
+    Player-independent figures for every rival still able to bid: needs
+    analysis, hard max, budget multiplier and per-slot bid cap. Build once
+    and pass to estimate_competition when estimating many players.
+    """
+    rivals = []
+    for team_name, team_info in all_teams_data.items():
+        if team_name == "Abhijeet":
+            continue  # skip our team
+
+        budget_left = team_info["budget_left"]
+        slots_left = team_info["slots_left"]
+
+        if slots_left <= 0 or budget_left < BASE_PRICE:
+            continue
+
+        # Budget capacity: slight influence (not a multiplier to prevent blowup)
+        # Teams with less budget are less aggressive
+        budget_factor = min(1.0, budget_left / (slots_left * BASE_PRICE * 2))
+
+        rivals.append({
+            "team": team_name,
+            "needs": analyze_squad_needs(team_info["squad"]),
+            "budget_left": budget_left,
+            "slots_left": slots_left,
+            # Hard max this team can bid
+            "hard_max": budget_left - (slots_left - 1) * BASE_PRICE if slots_left > 1 else budget_left,
+            "budget_mult": 0.6 + budget_factor * 0.4,
+            # Won't spend more than ~1.3× their average per slot
+            "slot_cap": budget_left / max(slots_left, 1) * 1.3,
+        })
+    return rivals
+
+
+def estimate_competition(player, all_teams_data, unsold_players, rivals=None, role_counts=None):
     """
     Estimate which other teams will bid on this player and how high.
 
@@ -325,30 +447,40 @@ def estimate_competition(player, all_teams_data, unsold_players):
       - Player's overall rating vs. alternatives available
       - How many slots the team still needs to fill
 
+    `rivals` optionally takes _rival_profiles(all_teams_data), for callers
+    that estimate many players against the same teams, and `role_counts`
+    maps role → number of `unsold_players` with that role (the player
+    itself must be one of them).
+
     Returns:
         list of dicts: [{team, desire_score, estimated_max_bid, reason}]
         sorted by desire_score descending.
     """
+    if rivals is None:
+        rivals = _rival_profiles(all_teams_data)
+
     competitors = []
     total_unsold = len(unsold_players)
+    role = player["role"]
+    can_bowl = player["can_bowl"]
 
-    for team_name, team_info in all_teams_data.items():
-        if team_name == "Abhijeet":
-            continue  # skip our team
-
-        squad = team_info["squad"]
-        budget_left = team_info["budget_left"]
-        slots_left = team_info["slots_left"]
-
-        if slots_left <= 0 or budget_left < BASE_PRICE:
-            continue
-
-        # Hard max this team can bid
-        hard_max = budget_left - (slots_left - 1) * BASE_PRICE if slots_left > 1 else budget_left
+    # Team-independent terms, computed once rather than per rival
+    if role_counts is not None:
+        same_role_remaining = role_counts[role] - 1
+    else:
+        same_role_remaining = sum(1 for p in unsold_players
+                                   if p["role"] == role and p["id"] != player["id"])
+    total_slots_all_teams = sum(t["slots_left"] for t in all_teams_data.values())
+    # Auction progress: early on (36 players for 36 slots = everyone gets
+    # someone) competition is spread thin
+    plentiful_supply = (
+        total_unsold > 0
+        and total_unsold / max(total_slots_all_teams, 1) > 1.5
+    )
 
-        # Analyze what this team needs
-        needs = analyze_squad_needs(squad)
-        role = player["role"]
+    for rival in rivals:
+        needs = rival["needs"]
+        slots_left = rival["slots_left"]
         desire = 0.0
         reasons = []
 
@@ -358,7 +490,7 @@ def estimate_competition(player, all_teams_data, unsold_players):
             reasons.append(f"Needs {role}")
 
         # Bowling need
-        if needs["bowlers_needed"] > 0 and _can_bowl(player):
+        if needs["bowlers_needed"] > 0 and can_bowl:
             desire += 1.5
             reasons.append(f"Needs bowling ({needs['bowlers_needed']} more)")
 
@@ -371,42 +503,27 @@ def estimate_competition(player, all_teams_data, unsold_players):
             reasons.append("Strong player (Tier 2)")
 
         # Scarcity: only matters when pool is running thin
-        same_role_remaining = sum(1 for p in unsold_players
-                                   if p["role"] == role and p["id"] != player["id"])
         if same_role_remaining < slots_left and same_role_remaining <= 3:
             desire += 1.0
             reasons.append(f"Only {same_role_remaining} {role}s left in pool")
 
-        # Budget capacity: slight influence (not a multiplier to prevent blowup)
-        # Teams with less budget are less aggressive
-        budget_factor = min(1.0, budget_left / (slots_left * BASE_PRICE * 2))
-        desire *= (0.6 + budget_factor * 0.4)
+        desire *= rival["budget_mult"]
 
-        # Auction progress factor: early in auction, competition is spread thin
-        # (36 players for 36 slots = everyone gets someone)
-        total_slots_all_teams = sum(t["slots_left"] for t in all_teams_data.values())
-        if total_unsold > 0:
-            supply_ratio = total_unsold / max(total_slots_all_teams, 1)
-            if supply_ratio > 1.5:
-                # Plenty of players available, less urgency
-                desire *= 0.6
+        # Plenty of players available, less urgency
+        if plentiful_supply:
+            desire *= 0.6
 
         # Estimate their max bid — conservative: based on even budget split
-        avg_budget_per_slot = budget_left / max(slots_left, 1)
-        estimated_bid = int(min(
-            BASE_PRICE + desire * 1.5,
-            avg_budget_per_slot * 1.3,  # won't spend more than ~1.3× their average per slot
-            hard_max
-        ))
+        estimated_bid = int(min(BASE_PRICE + desire * 1.5, rival["slot_cap"], rival["hard_max"]))
         estimated_bid = max(estimated_bid, BASE_PRICE)
 
         if desire > 0:
             competitors.append({
-                "team": team_name,
+                "team": rival["team"],
                 "desire_score": round(desire, 1),
                 "estimated_max_bid": estimated_bid,
                 "reasons": reasons,
-                "budget_left": budget_left,
+                "budget_left": rival["budget_left"],
                 "slots_left": slots_left,
             })
 
@@ -414,15 +531,16 @@ def estimate_competition(player, all_teams_data, unsold_players):
     return competitors
 
 
-def predict_auction_price(player, all_teams_data, unsold_players):
+def predict_auction_price(player, all_teams_data, unsold_players, rivals=None, role_counts=None):
     """
     Predict what a player will sell for in the auction based on
     competition analysis.
 
     Returns:
-        dict with predicted_price, competition_level, competing_teams
+        dict with predicted_price, competition_level, competing_teams (top 3),
+        price_range and competitors (the full estimate_competition list)
     """
-    competitors = estimate_competition(player, all_teams_data, unsold_players)
+    competitors = estimate_competition(player, all_teams_data, unsold_players, rivals, role_counts)
 
     if not competitors:
         return {
@@ -430,13 +548,14 @@ def predict_auction_price(player, all_teams_data, unsold_players):
             "competition_level": "🟢 Low",
             "competing_teams": [],
             "price_range": (BASE_PRICE, BASE_PRICE),
+            "competitors": competitors,
         }
 
     # The predicted price is driven by the 2nd highest bidder
     # (in an auction, price = 2nd highest bid + 1)
     bids = sorted([c["estimated_max_bid"] for c in competitors], reverse=True)
     if len(bids) >= 2:
-        predicted = min(bids[0], bids[1] + BID_INCREMENT_VAL())
+        predicted = min(bids[0], bids[1] + BID_INCREMENT)
     else:
         predicted = bids[0]
 
@@ -466,15 +585,10 @@ def predict_auction_price(player, all_teams_data, unsold_players):
         "competition_level": level,
         "competing_teams": competitors[:3],
         "price_range": (low_price, high_price),
+        "competitors": competitors,
     }
 
 
-def BID_INCREMENT_VAL():
-    """Return the bid increment value."""
-    from players import BID_INCREMENT
-    return BID_INCREMENT
-
-
 # ═══════════════════════════════════════════════════════════════════════
 # BEST TEAM BUILDER — Real-time best team at every point
 # ═══════════════════════════════════════════════════════════════════════
@@ -519,19 +633,25 @@ def build_best_team_snapshot(my_squad, unsold_players, budget_remaining, slots_l
     scored_players = []
     needs_analysis = analyze_squad_needs(my_squad)
     optimal_ids = {op["id"] for op in optimal_picks} if optimal_picks else set()
-
-    for p in unsold_players:
-        comp = estimate_competition(p, all_teams_data, unsold_players)
-        competing_teams = len([c for c in comp if c["desire_score"] > 2.5])
+    # Rival squads and budgets don't change while we score the pool
+    rivals = _rival_profiles(all_teams_data)
+    pool = _pool_arrays(unsold_players)
+    role_counts = Counter(pool["roles"].tolist())
+
+    # Base value scores for the whole pool in one vectorized pass
+    base_scores = np.round(_player_value_scores(
+        pool["overall"], pool["bowling"], pool["tiers"], pool["roles"], needs_analysis["role_needs"],
+    ), 2).tolist()
+
+    for p, value_score in zip(unsold_players, base_scores):
+        predicted = predict_auction_price(p, all_teams_data, unsold_players, rivals, role_counts)
+        competing_teams = sum(1 for c in predicted["competitors"] if c["desire_score"] > 2.5)
         # Acquisition probability: based on how many teams seriously want this player
         # With 4 teams total (3 rivals), even 2 competitors leaves a decent chance
         acq_prob = max(0.15, 1.0 - competing_teams * 0.2)
 
-        predicted = predict_auction_price(p, all_teams_data, unsold_players)
         est_cost = predicted["predicted_price"]
 
-        value_score = _player_value_score(p, needs_analysis["role_needs"])
-
         # CRITICAL: Boost players that the MILP optimizer chose
         # The optimizer already found the mathematically best set — trust it
         if p["id"] in optimal_ids:
@@ -575,8 +695,8 @@ def build_best_team_snapshot(my_squad, unsold_players, budget_remaining, slots_l
 
     # Priority targets
     priority_targets = []
-    for p in scored_players[:min(10, len(scored_players))]:
-        is_optimal = p["id"] in {op["id"] for op in optimal_picks}
+    for p in scored_players[:10]:
+        is_optimal = p["id"] in optimal_ids
         priority_targets.append({
             "name": p["name"],
             "role": p["role"],
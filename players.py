@@ -63,9 +63,10 @@ VICE_CAPTAINS = [
 PLAYERS = AUCTION_PLAYERS + CAPTAINS + VICE_CAPTAINS
 
 # ── Pre-assigned mapping (captain + vice-captain auto-belong to team) ─
-PRE_ASSIGNED = {}
-for _p in CAPTAINS + VICE_CAPTAINS:
-    PRE_ASSIGNED[_p["id"]] = {"team": _p["team"], "tag": _p["tag"]}
+PRE_ASSIGNED = {
+    p["id"]: {"team": p["team"], "tag": p["tag"]}
+    for p in CAPTAINS + VICE_CAPTAINS
+}
 
 # ── Teams ────────────────────────────────────────────────────────────
 TEAMS = {
@@ -106,6 +107,11 @@ def compute_overall(player):
     return round(player["batting"] * 0.40 + player["bowling"] * 0.40 + player["fielding"] * 0.20, 1)
 
 
+def can_bowl(player):
+    """A player is a bowling option if bowling rating >= 4."""
+    return player["bowling"] >= 4
+
+
 def classify_tier(player):
     """
     Tier classification:
@@ -133,3 +139,4 @@ for p in PLAYERS:
     p["role"] = classify_role(p)
     p["overall"] = compute_overall(p)
     p["tier"] = classify_tier(p)
+    p["can_bowl"] = can_bowl(p)